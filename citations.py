@@ -0,0 +1,183 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit, urlunsplit
+
+# Deterministic URL canonicalization and citation dedup.
+# =============================================================================
+#
+# Search results and LLM output cite the same page under many spellings:
+# http vs https, `www.`/`m.`/`amp.` hosts, AMP paths and caches, tracking
+# parameters, fragments and trailing slashes. `canonicalize_url` maps all of
+# those to one key; everything is pure string work behind an LRU cache, so
+# batches of thousands of URLs are canonicalized in well under a second.
+#
+# The canonical form is only a dedup key and may not resolve (forced https,
+# stripped hosts and AMP paths). What is shown and linked is the first-seen
+# published URL, cleaned of tracking parameters by `display_url`.
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "twclid",
+    "igshid", "mc_cid", "mc_eid", "_ga", "_gl", "_hsenc", "_hsmi", "mkt_tok",
+    "ref", "ref_src", "ref_url", "referrer", "cmpid", "spm", "ocid", "ito",
+    "smid", "sr_share", "amp", "outputtype",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_", "hmb_", "at_")
+STRIPPED_HOST_PREFIXES = ("www.", "amp.", "m.", "mobile.")
+
+_AMP_CACHE_HOST = re.compile(r"(^|\.)cdn\.ampproject\.org$")
+_AMP_PATH_SUFFIX = re.compile(r"(/amp|\.amp|/amp\.html)$", re.IGNORECASE)
+_DUPLICATE_SLASHES = re.compile(r"/{2,}")
+
+
+def _is_tracking_param(key: str) -> bool:
+    key = key.lower()
+    return key in TRACKING_PARAMS or key.startswith(TRACKING_PREFIXES)
+
+
+def _with_http_scheme(url: str):
+    """
+    `url` with an explicit scheme: bare hosts ("example.com/x") get https, http(s)
+    URLs are returned as they are, anything else (mailto:, javascript:, ...) is None.
+    """
+    if url.startswith("//"):
+        return "https:" + url
+    try:
+        scheme = urlsplit(url).scheme.lower()
+    except ValueError:
+        return None
+    if scheme in ("http", "https"):
+        return url
+    # "example.com:8080/x" parses with "example.com" as its scheme
+    if scheme and "." not in scheme:
+        return None
+    return "https://" + url
+
+
+def _split_http_url(url: str):
+    """
+    `url` (bare hosts get https) split into its parts, or None unless it is a
+    well-formed http(s) URL with a host. Malformed ports or IPv6 hosts are None.
+    """
+    url = _with_http_scheme(url)
+    if url is None:
+        return None
+    try:
+        parts = urlsplit(url)
+        parts.port  # raises ValueError for non-numeric or out-of-range ports
+    except ValueError:
+        return None
+    return parts if parts.hostname else None
+
+
+def _unwrap_amp_cache(host: str, path: str):
+    """Map AMP cache URLs (cdn.ampproject.org, google.com/amp) back to the publisher URL."""
+    if _AMP_CACHE_HOST.search(host):
+        # /c/s/example.com/path (https) or /c/example.com/path (http)
+        parts = path.split("/", 4)[2:]
+        if parts and parts[0] in ("c", "v", "i"):
+            parts = parts[1:]
+        if parts and parts[0] == "s":
+            parts = parts[1:]
+        if parts:
+            return "/".join(parts)
+    bare_host = host[4:] if host.startswith("www.") else host
+    if (bare_host == "google.com" or bare_host.startswith("google.")) and path.startswith("/amp/"):
+        target = path[len("/amp/"):]
+        return target[2:] if target.startswith("s/") else target
+    return None
+
+
+@lru_cache(maxsize=65536)
+def canonicalize_url(url: str) -> str:
+    """
+    Return the canonical form of `url`, or the stripped input if it is not
+    an http(s) URL. Two citations are duplicates iff their canonical URLs match.
+    """
+    stripped = (url or "").strip()
+    if not stripped:
+        return ""
+    parts = _split_http_url(stripped)
+    if parts is None:
+        return stripped
+
+    host = parts.hostname.rstrip(".")
+    if not host:
+        return stripped
+
+    unwrapped = _unwrap_amp_cache(host, parts.path)
+    if unwrapped:
+        query = f"?{parts.query}" if parts.query else ""
+        return canonicalize_url(f"https://{unwrapped}{query}")
+
+    for prefix in STRIPPED_HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") > 1:
+            host = host[len(prefix):]
+            break
+
+    # Default ports are dropped along with user info; explicit ones are kept
+    port = parts.port if parts.port not in (None, 80, 443) else None
+    netloc = f"{host}:{port}" if port else host
+
+    path = _DUPLICATE_SLASHES.sub("/", quote(unquote(parts.path), safe="/:@!$&'()*+,;=-._~"))
+    path = _AMP_PATH_SUFFIX.sub("", path.rstrip("/")).rstrip("/")
+
+    query = urlencode(sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(key)
+    ))
+
+    return urlunsplit(("https", netloc, path, query, ""))
+
+
+def display_url(url: str) -> str:
+    """
+    `url` as its publisher wrote it, minus tracking parameters (bare hosts get
+    https). Returns "" for anything that is not an http(s) URL.
+    """
+    parts = _split_http_url((url or "").strip())
+    if parts is None:
+        return ""
+    # Filter the raw query so the parameters that are kept keep their original encoding
+    query = "&".join(
+        param for param in parts.query.split("&")
+        if param and not _is_tracking_param(unquote(param.split("=", 1)[0]))
+    )
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, parts.fragment))
+
+
+def canonicalize_urls(urls: Iterable[str]) -> List[str]:
+    """Batch form of `canonicalize_url`."""
+    return [canonicalize_url(url) for url in urls]
+
+
+def dedupe_citations(citations: Iterable[Any]) -> List[Dict[str, str]]:
+    """
+    Collapse citations (dicts with `url` or `link`, or bare URL strings) to one
+    `{"title", "url"}` entry per canonical URL, keeping first-seen order, the
+    first-seen `display_url` and the first non-empty title. Non-http(s) links
+    (mailto:, javascript:, ...) are dropped.
+    """
+    unique: Dict[str, Dict[str, str]] = {}
+    for citation in citations:
+        if isinstance(citation, str):
+            url, title = citation, ""
+        elif isinstance(citation, dict):
+            url = citation.get("url") or citation.get("link") or ""
+            title = citation.get("title") or ""
+        else:
+            continue
+
+        link = display_url(url)
+        if not link:
+            continue
+        canonical = canonicalize_url(link)
+        if canonical not in unique:
+            unique[canonical] = {"title": title, "url": link}
+        elif title and not unique[canonical]["title"]:
+            unique[canonical]["title"] = title
+
+    for citation in unique.values():
+        citation["title"] = citation["title"] or "No Title Available"
+    return list(unique.values())
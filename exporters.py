@@ -0,0 +1,195 @@
+import argparse
+import csv
+import json
+import os
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import result_store
+
+# Bulk export of stored fact-check runs.
+# =============================================================================
+#
+# `export_runs` streams every run matching the History filters out of the result
+# store in keyset-paginated chunks (`result_store.iter_runs`) and appends each
+# chunk to the output, so memory stays flat however many runs are exported:
+#   * jsonl    - one run per line, citations and timings nested
+#   * csv      - a runs table plus a flattened `<name>_citations.csv`
+#   * parquet  - the same two tables as Parquet, one row group per chunk
+#                (needs the optional `pyarrow` package)
+# Run rows carry one `timing_<stage>_s` column per crew stage.
+#
+# CLI: `python exporters.py --format parquet --out runs.parquet --verdict Fake`
+
+EXPORT_FORMATS = ("jsonl", "csv", "parquet")
+DEFAULT_CHUNK_SIZE = 1000
+
+TIMING_STAGES = ("content_analysis", "claim_verification", "final_verdict", "total")
+RUN_COLUMNS = (
+    "id", "created_at", "claim", "verdict", "total_sources", "execution_time", "mode",
+    "parent_run_id", "recommendation", "verdict_reasoning",
+    *(f"timing_{stage}_s" for stage in TIMING_STAGES),
+)
+CITATION_COLUMNS = ("run_id", "position", "title", "url", "domain")
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).isoformat(timespec="seconds") if timestamp else None
+
+
+def run_row(run: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a stored run into one `RUN_COLUMNS` row."""
+    report = run.get("final_report") or {}
+    timings = run.get("timings") or {}
+    row = {
+        "id": run["id"],
+        "created_at": _iso(run["created_at"]),
+        "claim": run["claim"],
+        "verdict": run.get("verdict"),
+        "total_sources": run.get("total_sources"),
+        "execution_time": run.get("execution_time"),
+        "mode": run.get("mode"),
+        "parent_run_id": run.get("parent_run_id"),
+        "recommendation": report.get("recommendation"),
+        "verdict_reasoning": report.get("verdict_reasoning"),
+    }
+    for stage in TIMING_STAGES:
+        row[f"timing_{stage}_s"] = timings.get(stage)
+    return row
+
+
+def citation_rows(run: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """One `CITATION_COLUMNS` row per supporting citation of a stored run."""
+    citations = (run.get("final_report") or {}).get("supporting_citations") or []
+    return [
+        {
+            "run_id": run["id"],
+            "position": position,
+            "title": citation.get("title", ""),
+            "url": citation.get("url", ""),
+            "domain": result_store.citation_domain(citation.get("url", "")),
+        }
+        for position, citation in enumerate(citations)
+        if isinstance(citation, dict)
+    ]
+
+
+def citations_path(path: str) -> str:
+    """'out/runs.csv' -> 'out/runs_citations.csv'"""
+    stem, extension = os.path.splitext(path)
+    return f"{stem}_citations{extension}"
+
+
+def _write_jsonl(path: str, chunks: Iterator[List[Dict[str, Any]]]) -> Tuple[int, int, List[str]]:
+    runs = citations = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in chunks:
+            for run in chunk:
+                record = run_row(run)
+                record["timings"] = run.get("timings") or {}
+                record["citations"] = [
+                    {key: row[key] for key in ("position", "title", "url", "domain")} for row in citation_rows(run)
+                ]
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                runs += 1
+                citations += len(record["citations"])
+    return runs, citations, [path]
+
+
+def _write_csv(path: str, chunks: Iterator[List[Dict[str, Any]]]) -> Tuple[int, int, List[str]]:
+    runs = citations = 0
+    with open(path, "w", encoding="utf-8", newline="") as runs_file, \
+            open(citations_path(path), "w", encoding="utf-8", newline="") as citations_file:
+        runs_writer = csv.DictWriter(runs_file, fieldnames=RUN_COLUMNS)
+        citations_writer = csv.DictWriter(citations_file, fieldnames=CITATION_COLUMNS)
+        runs_writer.writeheader()
+        citations_writer.writeheader()
+        for chunk in chunks:
+            rows = [citation for run in chunk for citation in citation_rows(run)]
+            runs_writer.writerows(run_row(run) for run in chunk)
+            citations_writer.writerows(rows)
+            runs += len(chunk)
+            citations += len(rows)
+    return runs, citations, [path, citations_path(path)]
+
+
+def _write_parquet(path: str, chunks: Iterator[List[Dict[str, Any]]]) -> Tuple[int, int, List[str]]:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet export needs pyarrow: pip install pyarrow") from e
+
+    # Fixed schemas, so an all-null column in the first chunk cannot change a column's type
+    run_schema = pa.schema(
+        [
+            ("id", pa.int64()), ("created_at", pa.string()), ("claim", pa.string()), ("verdict", pa.string()),
+            ("total_sources", pa.int64()), ("execution_time", pa.float64()), ("mode", pa.string()),
+            ("parent_run_id", pa.int64()), ("recommendation", pa.string()), ("verdict_reasoning", pa.string()),
+        ]
+        + [(f"timing_{stage}_s", pa.float64()) for stage in TIMING_STAGES]
+    )
+    citation_schema = pa.schema(
+        [("run_id", pa.int64()), ("position", pa.int32()), ("title", pa.string()), ("url", pa.string()), ("domain", pa.string())]
+    )
+
+    runs = citations = 0
+    with pq.ParquetWriter(path, run_schema) as runs_writer, \
+            pq.ParquetWriter(citations_path(path), citation_schema) as citations_writer:
+        for chunk in chunks:
+            rows = [citation for run in chunk for citation in citation_rows(run)]
+            runs_writer.write_table(pa.Table.from_pylist([run_row(run) for run in chunk], schema=run_schema))
+            if rows:
+                citations_writer.write_table(pa.Table.from_pylist(rows, schema=citation_schema))
+            runs += len(chunk)
+            citations += len(rows)
+    return runs, citations, [path, citations_path(path)]
+
+
+_WRITERS = {"jsonl": _write_jsonl, "csv": _write_csv, "parquet": _write_parquet}
+
+
+def export_runs(
+    path: str,
+    fmt: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    db_path: Optional[str] = None,
+    **filters,
+) -> Dict[str, Any]:
+    """
+    Write every run matching `filters` (see `result_store.list_runs`) to `path`.
+    `fmt` defaults to the file extension. Returns `{"runs", "citations", "files"}`.
+    """
+    fmt = (fmt or os.path.splitext(path)[1].lstrip(".")).lower()
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unknown export format '{fmt}'. Choose one of: {', '.join(EXPORT_FORMATS)}")
+    if filters.get("verdict") and filters["verdict"] not in result_store.VERDICTS:
+        raise ValueError(f"Unknown verdict '{filters['verdict']}'. Choose one of: {', '.join(result_store.VERDICTS)}")
+
+    runs, citations, files = _WRITERS[fmt](path, result_store.iter_runs(chunk_size=chunk_size, db_path=db_path, **filters))
+    return {"runs": runs, "citations": citations, "files": files}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export stored FactBot runs.")
+    parser.add_argument("--out", required=True, help="output file; CSV/Parquet also write <name>_citations.<ext>")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, help="default: taken from the --out extension")
+    parser.add_argument("--verdict", choices=result_store.VERDICTS, help="only runs with this verdict")
+    parser.add_argument("--domain", help="only runs citing this domain, e.g. reuters.com")
+    parser.add_argument("--search", help="full-text search over the claims")
+    parser.add_argument("--since", type=date.fromisoformat, help="first day, YYYY-MM-DD")
+    parser.add_argument("--until", type=date.fromisoformat, help="last day (inclusive), YYYY-MM-DD")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="runs read and written per batch")
+    args = parser.parse_args()
+
+    summary = export_runs(
+        args.out,
+        fmt=args.format,
+        chunk_size=args.chunk_size,
+        verdict=args.verdict,
+        domain=args.domain,
+        search=args.search,
+        since=datetime.combine(args.since, datetime.min.time()).timestamp() if args.since else None,
+        until=datetime.combine(args.until + timedelta(days=1), datetime.min.time()).timestamp() if args.until else None,
+    )
+    print(f"Exported {summary['runs']} runs and {summary['citations']} citations to {', '.join(summary['files'])}")
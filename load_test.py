@@ -0,0 +1,259 @@
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+# Load-testing harness for concurrent Streamlit sessions.
+# =============================================================================
+#
+# Drives N simultaneous headless sessions of `main.py` through Streamlit's
+# `AppTest`, each one entering a claim and clicking "Analyze Claim" like a
+# user would. `trigger_crew` is replaced by a stub whose latency follows one of
+# the profiles below, so no LLM or search API is called and the numbers reflect
+# the app itself: script reruns, rendering, history writes and the blocking
+# crew call holding a script thread.
+#
+#   python load_test.py --levels 1,2,4,8,16 --profile fast
+
+# (median seconds, lognormal sigma) of a stubbed crew run
+LATENCY_PROFILES = {
+    "instant": (0.0, 0.0),
+    "fast": (0.5, 0.3),
+    "typical": (5.0, 0.4),
+    "slow": (20.0, 0.6),
+}
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+
+def install_stub_crew(profile: str, scale: float, seed: int):
+    """
+    Register a fake `trigger_crew` module before the app imports it.
+    Returns a dict (claim -> seconds slept) so crew time can be separated from UI time.
+    """
+    median, sigma = LATENCY_PROFILES[profile]
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+    crew_seconds: Dict[str, float] = {}
+
+    def run_fact_check(news_headline_or_topic, **kwargs):
+        with rng_lock:
+            latency = rng.lognormvariate(0, sigma) * median * scale if median else 0.0
+        time.sleep(latency)
+        crew_seconds[news_headline_or_topic] = latency
+        return {
+            "claim": news_headline_or_topic,
+            "started_at": time.time(),
+            "final_report": {
+                "final_verdict": "Uncertain",
+                "verdict_reasoning": "Stubbed load-test verdict.",
+                "recommendation": "Proceed with caution.",
+                "supporting_citations": [
+                    {"title": f"Source {i}", "url": f"https://example.com/source/{i}"} for i in range(5)
+                ],
+                "total_sources_checked": 5,
+            },
+            "stage_outputs": {},
+            "timings": {"total": latency},
+            "searches": [],
+        }
+
+    def resynthesize_verdict(*args, **kwargs):
+        raise RuntimeError("Refreshes are not exercised by the load test")
+
+    stub = types.ModuleType("trigger_crew")
+    stub.SPECULATIVE_EXECUTION = False
+    stub.run_fact_check = run_fact_check
+    stub.fact_check_crew = lambda news_headline_or_topic: run_fact_check(news_headline_or_topic)["final_report"]
+    stub.resynthesize_verdict = resynthesize_verdict
+    sys.modules["trigger_crew"] = stub
+    return crew_seconds
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Not Linux: peak RSS is the best available proxy (KB on Linux/BSD, bytes on macOS)
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RssSampler(threading.Thread):
+    """Polls process RSS while a load level runs and keeps the peak."""
+
+    def __init__(self, interval: float = 0.05):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = rss_bytes()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, rss_bytes())
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def run_session(session_id: int, checks: int, timeout: float) -> Dict[str, Any]:
+    """One simulated user: open the app, then submit `checks` claims one after another."""
+    from streamlit.testing.v1 import AppTest
+
+    reruns: List[float] = []
+    claims: List[str] = []
+
+    def timed(step):
+        start = time.perf_counter()
+        step()
+        reruns.append(time.perf_counter() - start)
+
+    try:
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        timed(at.run)
+        for check in range(checks):
+            claim = f"Load test claim {session_id}-{check}: a new study says chocolate improves memory"
+            claims.append(claim)
+            if at.text_area(key="user_input_textarea").disabled:
+                # The inputs stay disabled after a result until the next rerun (any click)
+                timed(at.run)
+            timed(at.text_area(key="user_input_textarea").input(claim).run)
+            # Clicking sets is_processing and reruns; the crew call happens inside this rerun
+            timed(at.button(key="analyze_claim_btn").click().run)
+            if at.exception:
+                raise RuntimeError(at.exception[0].message)
+        return {"ok": True, "reruns": reruns, "claims": claims, "app": at}
+    except Exception as e:
+        return {"ok": False, "reruns": reruns, "claims": claims, "error": str(e)}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run_level(concurrency: int, checks: int, timeout: float, crew_seconds: Dict[str, float]) -> Dict[str, Any]:
+    gc.collect()
+    baseline = rss_bytes()
+    sampler = RssSampler()
+    sampler.start()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        sessions = list(pool.map(lambda i: run_session(i, checks, timeout), range(concurrency)))
+    wall = time.perf_counter() - start
+
+    sampler.stop()
+    # Sessions (and their element trees) are still referenced here, so the peak includes them
+    peak = max(sampler.peak, rss_bytes())
+
+    completed = [s for s in sessions if s["ok"]]
+    reruns = [latency for s in completed for latency in s["reruns"]]
+    crew_time = sum(crew_seconds.get(claim, 0.0) for s in completed for claim in s["claims"])
+    ui_time = sum(reruns) - crew_time
+
+    return {
+        "concurrency": concurrency,
+        "sessions": len(sessions),
+        "errors": len(sessions) - len(completed),
+        "error_samples": [s["error"] for s in sessions if not s["ok"]][:3],
+        "wall_seconds": round(wall, 3),
+        "sessions_per_sec": round(len(completed) / wall, 3) if wall else 0.0,
+        "checks_per_sec": round(len(completed) * checks / wall, 3) if wall else 0.0,
+        "rerun_p50_ms": round(percentile(reruns, 50) * 1000, 1),
+        "rerun_p95_ms": round(percentile(reruns, 95) * 1000, 1),
+        "rerun_max_ms": round(max(reruns, default=0.0) * 1000, 1),
+        "ui_ms_per_rerun": round(ui_time / len(reruns) * 1000, 1) if reruns else 0.0,
+        "memory_per_session_mb": round(max(peak - baseline, 0) / concurrency / 2**20, 2),
+        "peak_rss_mb": round(peak / 2**20, 1),
+    }
+
+
+def find_saturation(results: List[Dict[str, Any]], min_gain: float, max_p95_ms: float):
+    """
+    First concurrency level at which adding sessions stops paying off: throughput
+    grows by less than `min_gain`, p95 rerun latency exceeds `max_p95_ms`, or sessions fail.
+    """
+    best = 0.0
+    for level in results:
+        if level["errors"] or (max_p95_ms and level["rerun_p95_ms"] > max_p95_ms):
+            return level["concurrency"]
+        if best and level["sessions_per_sec"] < best * (1 + min_gain):
+            return level["concurrency"]
+        best = max(best, level["sessions_per_sec"])
+    return None
+
+
+def print_report(results: List[Dict[str, Any]], saturation):
+    header = f"{'sessions':>8} {'sess/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'UI ms':>8} {'MB/sess':>8} {'errors':>7}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['concurrency']:>8} {r['sessions_per_sec']:>8.2f} {r['rerun_p50_ms']:>9.1f} {r['rerun_p95_ms']:>9.1f} "
+            f"{r['rerun_max_ms']:>9.1f} {r['ui_ms_per_rerun']:>8.1f} {r['memory_per_session_mb']:>8.2f} {r['errors']:>7}"
+        )
+        for error in r["error_samples"]:
+            print(f"{'':>8} error: {error}")
+    print()
+    if saturation is None:
+        print("No saturation reached; try higher --levels.")
+    else:
+        print(f"Saturation point: {saturation} concurrent sessions (throughput stopped scaling or latency/error limits hit).")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the FactBot Streamlit app with concurrent headless sessions.")
+    parser.add_argument("--levels", default="1,2,4,8,16,32", help="comma-separated concurrent session counts to ramp through")
+    parser.add_argument("--profile", choices=sorted(LATENCY_PROFILES), default="fast", help="stubbed crew latency profile")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="multiplier applied to the profile's latencies")
+    parser.add_argument("--checks", type=int, default=1, help="claims each session submits")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-rerun timeout in seconds")
+    parser.add_argument("--min-gain", type=float, default=0.10, help="throughput gain below which a level counts as saturated")
+    parser.add_argument("--max-p95-ms", type=float, default=0.0, help="p95 rerun latency that counts as saturated (0 = off)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    # Keep load-test runs out of the real history and skip the cosmetic progress delays
+    os.environ.setdefault("FACTBOT_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="factbot-load-"), "history.db"))
+    os.environ.setdefault("FACTBOT_PROGRESS_STEP_DELAY", "0")
+    os.environ.setdefault("FACTBOT_REFRESH_INTERVAL", "0")
+    # The app would hand checks to a running worker instead of the stub crew
+    os.environ.pop("FACTBOT_WORKER_ADDRESS", None)
+
+    crew_seconds = install_stub_crew(args.profile, args.latency_scale, args.seed)
+
+    # Warm-up session so module imports are not billed to the first level
+    run_session(-1, 1, args.timeout)
+
+    results = []
+    for concurrency in (int(level) for level in args.levels.split(",")):
+        result = run_level(concurrency, args.checks, args.timeout, crew_seconds)
+        results.append(result)
+        print(f"... {concurrency} sessions: {result['sessions_per_sec']:.2f} sessions/s", file=sys.stderr)
+
+    saturation = find_saturation(results, args.min_gain, args.max_p95_ms)
+    print_report(results, saturation)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"args": vars(args), "levels": results, "saturation_point": saturation}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,22 @@
 import streamlit as st
+import html
 import json
+import os
+import shutil
+import tempfile
 import time
-from datetime import datetime
+import zipfile
+from datetime import datetime, timedelta
 from typing import Dict, Any
 
 # importing crew module (ensure this path is correct for your project)
 # Make sure 'trigger_crew.py' is accessible or adjust the import path
-from trigger_crew import fact_check_crew 
+from trigger_crew import SPECULATIVE_EXECUTION, run_fact_check
+import result_store
+from exporters import EXPORT_FORMATS, export_runs
+from refresh import REFRESH_INTERVAL, RefreshScheduler
+from search_tools import DEFAULT_SEARCH_PRESET, SEARCH_PRESETS
+from worker import WORKER_ADDRESS, WorkerClient
 
 # Configure page settings
 st.set_page_config(
@@ -33,10 +43,33 @@ DARK_THEME = {
     "card-bg-gradient-dark": "#333333",
 }
 
+# Seconds per simulated progress step shown while the crew runs (0 disables the delay, e.g. for load tests)
+PROGRESS_STEP_DELAY = float(os.getenv("FACTBOT_PROGRESS_STEP_DELAY", "10.0"))
+
+SEARCH_PRESET_LABELS = {
+    "fast": "⚡ Fast - fewest searches",
+    "balanced": "⚖️ Balanced - dig deeper only when sources disagree",
+    "thorough": "🔬 Thorough - widest searches, highest cost",
+}
+
+VERDICT_OPTIONS = result_store.VERDICTS
+HISTORY_PAGE_SIZE = 20
+
 # Initialize processing state
 if "is_processing" not in st.session_state:
     st.session_state.is_processing = False
 
+# Keyset cursors for the history page: one (created_at, id) per page already visited
+if "history_cursors" not in st.session_state:
+    st.session_state.history_cursors = [None]
+
+@st.cache_resource
+def start_refresh_scheduler():
+    """Start one background refresher per server process (not per session)."""
+    scheduler = RefreshScheduler(interval=REFRESH_INTERVAL)
+    scheduler.start()
+    return scheduler
+
 def apply_dark_theme():
     """Applies the dark theme's CSS variables."""
     theme_colors = DARK_THEME
@@ -428,7 +461,7 @@ def display_results(result: Dict[str, Any], execution_time: str):
             <span style="font-size: 2.8rem; margin-right: 1.2rem; animation: bounceIn 0.8s ease-out;">{icon}</span>
             <div>
                 <h2 style="margin: 0; color: {verdict_color}; font-weight: 700;">
-                    VERDICT: <span class="status-badge {badge_class}">{result['final_verdict'].upper()}</span>
+                    VERDICT: <span class="status-badge {badge_class}">{html.escape(result['final_verdict'].upper())}</span>
                 </h2>
             </div>
         </div>
@@ -457,10 +490,10 @@ def display_results(result: Dict[str, Any], execution_time: str):
                 st.markdown(f"""
                 <div class="citation-card">
                     <h4 style="margin: 0 0 0.5rem 0;">
-                        {i}. {citation.get('title', 'No Title Available')}
+                        {i}. {html.escape(citation.get('title', 'No Title Available'))}
                     </h4>
-                    <a href="{citation.get('url', '#')}" target="_blank">
-                        🔗 {citation.get('url', 'URL Not Available')}
+                    <a href="{html.escape(citation.get('url', '#'))}" target="_blank">
+                        🔗 {html.escape(citation.get('url', 'URL Not Available'))}
                     </a>
                 </div>
                 """, unsafe_allow_html=True)
@@ -476,14 +509,162 @@ def display_results(result: Dict[str, Any], execution_time: str):
     with col2:
         st.metric(label="Analysis Time", value=execution_time)
 
+def history_page():
+    """Browse stored fact-check runs with filters and server-side (keyset) pagination."""
+    st.markdown("### 🗂️ Fact-Check History")
+
+    col_search, col_verdict, col_domain, col_dates = st.columns([3, 2, 2, 2])
+    with col_search:
+        search = st.text_input("Search claims", key="history_search", placeholder="e.g. G20 summit")
+    with col_verdict:
+        verdict = st.selectbox("Verdict", ["All"] + VERDICT_OPTIONS, key="history_verdict")
+    with col_domain:
+        domain = st.text_input("Cited domain", key="history_domain", placeholder="e.g. reuters.com")
+    with col_dates:
+        date_range = st.date_input("Date range", value=(), key="history_dates")
+
+    since = until = None
+    if len(date_range) == 2:
+        since = datetime.combine(date_range[0], datetime.min.time()).timestamp()
+        until = datetime.combine(date_range[1] + timedelta(days=1), datetime.min.time()).timestamp()
+
+    filters = dict(
+        verdict=None if verdict == "All" else verdict,
+        domain=domain.strip() or None,
+        since=since,
+        until=until,
+        search=search.strip() or None,
+    )
+
+    # Restart from the first page whenever the filters change
+    if st.session_state.get("history_filters") != filters:
+        st.session_state.history_filters = filters
+        st.session_state.history_cursors = [None]
+        clear_history_export()
+
+    page_index = len(st.session_state.history_cursors) - 1
+    runs = result_store.list_runs(
+        before=st.session_state.history_cursors[-1],
+        limit=HISTORY_PAGE_SIZE + 1, # one extra row tells us whether a next page exists
+        **filters
+    )
+    has_next = len(runs) > HISTORY_PAGE_SIZE
+    runs = runs[:HISTORY_PAGE_SIZE]
+
+    if not runs:
+        st.info("No fact-check runs match these filters yet.")
+
+    for run in runs:
+        checked_on = datetime.fromtimestamp(run["created_at"]).strftime('%Y-%m-%d %H:%M')
+        col_claim, col_result, col_view = st.columns([6, 2, 1])
+        with col_claim:
+            # Claims are typed by any user of the app: never render them as HTML
+            st.markdown(f"**{html.escape(run['claim'])}**  \n<span style='color: var(--secondary-text-color);'>{checked_on}</span>", unsafe_allow_html=True)
+        with col_result:
+            refreshed = " 🔄" if run["mode"] == "refresh" else ""
+            st.markdown(f"`{run['verdict'] or 'N/A'}`{refreshed}")
+        with col_view:
+            if st.button("View", key=f"history_view_{run['id']}", use_container_width=True):
+                st.session_state.history_selected = run["id"]
+
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if st.button("⬅️ Newer", disabled=page_index == 0, key="history_prev_btn", use_container_width=True):
+            st.session_state.history_cursors.pop()
+            st.rerun()
+    with col_page:
+        st.markdown(f"<p style='text-align: center;'>Page {page_index + 1}</p>", unsafe_allow_html=True)
+    with col_next:
+        if st.button("Older ➡️", disabled=not has_next, key="history_next_btn", use_container_width=True):
+            st.session_state.history_cursors.append((runs[-1]["created_at"], runs[-1]["id"]))
+            st.rerun()
+
+    export_history(filters)
+
+    selected = st.session_state.get("history_selected")
+    if selected:
+        run = result_store.get_run(selected)
+        if run:
+            st.markdown("---")
+            st.markdown(f"## 📋 {run['claim']}")
+            execution_time = run.get("execution_time")
+            report = run["final_report"]
+            if isinstance(report, dict) and report.get("final_verdict"):
+                display_results(report, f"{execution_time:.2f}s" if execution_time else "N/A")
+            else:
+                st.warning("The stored report for this run could not be parsed, so there is no verdict to show.")
+
+def clear_history_export():
+    """Delete this session's prepared export, if any. Each session keeps at most one on disk."""
+    st.session_state.pop("history_export", None)
+    export_dir = st.session_state.get("history_export_dir")
+    if export_dir:
+        shutil.rmtree(export_dir, ignore_errors=True)
+        os.makedirs(export_dir, exist_ok=True)
+
+def export_history(filters: Dict[str, Any]):
+    """Bulk export of every run matching the History filters (not just the current page)."""
+    with st.expander("📦 Export matching runs"):
+        # The export is written to disk in chunks, but Streamlit serves downloads from memory
+        st.caption("Downloads are held in memory by Streamlit; for very large exports use `python exporters.py`.")
+        col_format, col_prepare = st.columns([2, 1])
+        with col_format:
+            fmt = st.selectbox("Format", EXPORT_FORMATS, key="history_export_format")
+        with col_prepare:
+            prepare = st.button("Prepare export", key="history_export_btn", use_container_width=True)
+
+        if prepare:
+            clear_history_export()
+            if "history_export_dir" not in st.session_state:
+                st.session_state.history_export_dir = tempfile.mkdtemp(prefix="factbot-export-")
+            export_dir = st.session_state.history_export_dir
+            name = f"factcheck_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            try:
+                with st.spinner("Exporting runs..."):
+                    summary = export_runs(os.path.join(export_dir, f"{name}.{fmt}"), fmt=fmt, **filters)
+                    # CSV and Parquet come as a runs file plus a citations file: ship both in one zip
+                    if len(summary["files"]) > 1:
+                        archive = os.path.join(export_dir, f"{name}.zip")
+                        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+                            for path in summary["files"]:
+                                zf.write(path, os.path.basename(path))
+                                os.remove(path)
+                    else:
+                        archive = summary["files"][0]
+                st.session_state.history_export = {**summary, "path": archive}
+            except ImportError as e:
+                st.error(str(e))
+
+        export = st.session_state.get("history_export")
+        if export:
+            st.caption(f"{export['runs']} runs, {export['citations']} citations")
+            with open(export["path"], "rb") as f:
+                st.download_button(
+                    label="⬇️ Download",
+                    data=f,
+                    file_name=os.path.basename(export["path"]),
+                    mime="application/zip" if export["path"].endswith(".zip") else "application/x-ndjson",
+                    key="history_export_download_btn",
+                    use_container_width=True
+                )
+
 def main():
     """Main application function to run the FactBot AI interface."""
+    # Keep hot claims' verdicts current in the background (FACTBOT_REFRESH_INTERVAL > 0)
+    if REFRESH_INTERVAL > 0:
+        start_refresh_scheduler()
+
     # Apply dark theme CSS
     apply_dark_theme()
 
     # --- Main Content ---
     create_header()
 
+    page = st.sidebar.radio("Navigate", ["Fact-Check", "History"], key="nav_page", disabled=st.session_state.is_processing)
+    if page == "History":
+        history_page()
+        return
+
     st.markdown("### 📝 Enter News or Topic to Fact-Check")
     
     user_input = st.text_area(
@@ -495,6 +676,24 @@ def main():
         disabled=st.session_state.is_processing
     )
 
+    search_preset = st.radio(
+        "Search depth",
+        list(SEARCH_PRESETS),
+        index=list(SEARCH_PRESETS).index(DEFAULT_SEARCH_PRESET),
+        format_func=SEARCH_PRESET_LABELS.get,
+        horizontal=True,
+        key="search_preset_radio",
+        disabled=st.session_state.is_processing
+    )
+
+    speculative = st.toggle(
+        "Speculative verification",
+        value=SPECULATIVE_EXECUTION,
+        help="Start verifying the raw headline while its claims are still being extracted. Faster, at the cost of some searches that may be discarded.",
+        key="speculative_toggle",
+        disabled=st.session_state.is_processing
+    )
+
     # Initialize execution_time to ensure it's always defined
     execution_time_str = "0.00s"
     
@@ -536,10 +735,20 @@ def main():
             for progress, message in progress_steps:
                 progress_bar.progress(progress)
                 status_text.text(message)
-                time.sleep(10.0)  # Small delay for visual effect
+                time.sleep(PROGRESS_STEP_DELAY)  # Small delay for visual effect
             
-            # Call the fact-checking crew
-            result = fact_check_crew(news_headline_or_topic=user_input)
+            # Call the fact-checking crew: on the worker pool when one is configured (it also saves the run)
+            if WORKER_ADDRESS:
+                run = WorkerClient(WORKER_ADDRESS).fact_check(user_input, search_preset=search_preset, speculative=speculative)
+            else:
+                run = run_fact_check(news_headline_or_topic=user_input, search_preset=search_preset, speculative=speculative)
+
+                # Persist the run so it shows up in the History page
+                try:
+                    result_store.save_run(run)
+                except Exception as store_error:
+                    st.warning(f"Result could not be saved to history: {store_error}")
+            result = run["final_report"]
             
             # Record end time and calculate duration
             end_time = time.time()
@@ -0,0 +1,196 @@
+import atexit
+import hashlib
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, List, Optional
+
+# Observability for crew runs.
+# =============================================================================
+#
+# FACTBOT_OBSERVABILITY selects how much a run logs:
+#   off      - nothing
+#   summary  - one structured record per run (verdict, timings, sizes, log overhead)
+#   sampled  - summary, plus the full step/task trace of sampled or failed runs (default)
+#   full     - summary and full trace of every run
+#   verbose  - full, plus CrewAI's own verbose console output (the old behaviour)
+#
+# Records are JSON lines handed to a QueueHandler, so the run thread only pays
+# for an enqueue; a QueueListener thread writes them to a size-rotated file.
+# Each process writes its own file (the pid goes before the extension), since
+# rotation is not safe when several worker processes share one file.
+# Every field is truncated and each run's trace buffer is byte-capped, so
+# neither log volume nor memory grows with prompt or tool-output size.
+
+OBSERVABILITY_LEVELS = ("off", "summary", "sampled", "full", "verbose")
+
+OBSERVABILITY_LEVEL = os.getenv("FACTBOT_OBSERVABILITY", "sampled").lower()
+TRACE_SAMPLE_RATE = float(os.getenv("FACTBOT_TRACE_SAMPLE_RATE", "0.05"))
+TRACE_MAX_BYTES = int(os.getenv("FACTBOT_TRACE_MAX_BYTES", str(256 * 1024)))
+LOG_FIELD_LIMIT = int(os.getenv("FACTBOT_LOG_FIELD_LIMIT", "2000"))
+LOG_FILE = os.getenv("FACTBOT_LOG_FILE", os.path.join("logs", "factbot.log"))
+LOG_MAX_BYTES = int(os.getenv("FACTBOT_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("FACTBOT_LOG_BACKUP_COUNT", "5"))
+
+if OBSERVABILITY_LEVEL not in OBSERVABILITY_LEVELS:
+    raise ValueError(f"FACTBOT_OBSERVABILITY must be one of {', '.join(OBSERVABILITY_LEVELS)}, got '{OBSERVABILITY_LEVEL}'")
+
+_logger_lock = threading.Lock()
+_listener: Optional[QueueListener] = None
+
+
+def crew_verbose() -> bool:
+    """Whether Agents and the Crew should print CrewAI's verbose console output."""
+    return OBSERVABILITY_LEVEL == "verbose"
+
+
+def truncate(value: Any, limit: int = LOG_FIELD_LIMIT) -> str:
+    text = value if isinstance(value, str) else str(value)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... [truncated {len(text) - limit} chars]"
+
+
+class JsonLineFormatter(logging.Formatter):
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {"ts": round(record.created, 3), "level": record.levelname, "event": record.getMessage()}
+        payload.update(getattr(record, "fields", {}))
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def process_log_file(pid: Optional[int] = None) -> str:
+    """LOG_FILE for this process: 'logs/factbot.log' -> 'logs/factbot.<pid>.log'"""
+    stem, extension = os.path.splitext(LOG_FILE)
+    return f"{stem}.{pid or os.getpid()}{extension}"
+
+
+def get_logger() -> logging.Logger:
+    """The 'factbot' logger, wired to the background rotating-file writer on first use."""
+    global _listener
+    logger = logging.getLogger("factbot")
+    with _logger_lock:
+        if _listener is None:
+            log_file = process_log_file()
+            log_dir = os.path.dirname(log_file)
+            if log_dir:
+                os.makedirs(log_dir, exist_ok=True)
+            file_handler = RotatingFileHandler(log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+            file_handler.setFormatter(JsonLineFormatter())
+
+            log_queue = queue.Queue(maxsize=10000)
+            logger.addHandler(_DroppingQueueHandler(log_queue))
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+
+            _listener = QueueListener(log_queue, file_handler, respect_handler_level=False)
+            _listener.start()
+            atexit.register(_listener.stop)
+    return logger
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Never blocks the run thread: when the writer falls behind, records are dropped."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The formatter runs on the listener thread; skip QueueHandler's eager formatting
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def _describe_step(step: Any) -> Dict[str, str]:
+    """Compact view of a CrewAI agent step (AgentAction, AgentFinish, ToolResult, ...)."""
+    fields = {"type": type(step).__name__}
+    for attribute in ("tool", "tool_input", "thought", "result", "output", "text"):
+        value = getattr(step, attribute, None)
+        if value:
+            fields[attribute] = truncate(value)
+    return fields
+
+
+class RunTrace:
+    """
+    Collects one run's trace and emits its log records when the run finishes.
+    Pass `record_step` as the Crew's `step_callback` and call `record_task` for
+    each finished task, then `finish` exactly once (with `error` if the run failed).
+    """
+
+    def __init__(self, claim: str, kind: str = "fact_check"):
+        self.level = OBSERVABILITY_LEVEL
+        self.kind = kind
+        self.run_id = hashlib.sha1(f"{claim}{time.time()}{random.random()}".encode("utf-8")).hexdigest()[:12]
+        self.claim = claim
+        self.sampled = self.level in ("full", "verbose") or (self.level == "sampled" and random.random() < TRACE_SAMPLE_RATE)
+        # Unsampled runs still buffer (capped) so the trace can be kept if they fail
+        self.buffering = self.level in ("sampled", "full", "verbose")
+        self.events: List[Dict[str, Any]] = []
+        self.buffered_bytes = 0
+        self.dropped_events = 0
+        self.overhead = 0.0
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _buffer(self, event: Dict[str, Any], start: float):
+        size = len(json.dumps(event, ensure_ascii=False, default=str))
+        with self._lock:
+            if self.buffered_bytes + size > TRACE_MAX_BYTES:
+                self.dropped_events += 1
+            else:
+                self.events.append(event)
+                self.buffered_bytes += size
+            self.overhead += time.perf_counter() - start
+
+    def record_step(self, step: Any):
+        if self.buffering:
+            start = time.perf_counter()
+            self._buffer({"kind": "step", "at": round(start - self.started, 3), **_describe_step(step)}, start)
+
+    def record_task(self, name: str, raw_output: str):
+        if self.buffering:
+            start = time.perf_counter()
+            self._buffer({"kind": "task", "at": round(start - self.started, 3), "task": name, "output": truncate(raw_output)}, start)
+
+    def finish(self, report: Optional[Dict[str, Any]] = None, timings: Optional[Dict[str, float]] = None, error: Optional[BaseException] = None):
+        if self.level == "off":
+            return
+        start = time.perf_counter()
+        logger = get_logger()
+        keep_trace = self.buffering and (self.sampled or error is not None)
+
+        if keep_trace:
+            for event in self.events:
+                logger.info("trace", extra={"fields": {"run_id": self.run_id, **event}})
+
+        elapsed = time.perf_counter() - self.started
+        self.overhead += time.perf_counter() - start
+        summary = {
+            "run_id": self.run_id,
+            "kind": self.kind,
+            "claim": truncate(self.claim, 300),
+            "status": "failed" if error is not None else "ok",
+            "verdict": (report or {}).get("final_verdict"),
+            "sources": (report or {}).get("total_sources_checked"),
+            "timings": timings or {},
+            "trace_kept": keep_trace,
+            "trace_events": len(self.events),
+            "trace_bytes": self.buffered_bytes,
+            "trace_dropped_events": self.dropped_events,
+            "log_overhead_ms": round(self.overhead * 1000, 3),
+            "log_overhead_fraction": round(self.overhead / elapsed, 6) if elapsed else 0.0,
+        }
+        if error is not None:
+            summary["error"] = truncate(f"{type(error).__name__}: {error}")
+        logger.log(logging.ERROR if error is not None else logging.INFO, "run", extra={"fields": summary})
+
+        # Release the buffer right away; the trace object may outlive the run in callers
+        self.events = []
@@ -0,0 +1,172 @@
+import argparse
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import result_store
+from search_tools import DEFAULT_SEARCH_PRESET, RecordingSerperDevTool
+from trigger_crew import resynthesize_verdict, run_fact_check
+
+# Incremental re-verification of stored verdicts.
+# =============================================================================
+#
+# A refresh re-issues only the search queries recorded with a stored run and
+# diffs the returned evidence against what the stored verdict was based on:
+#   * nothing new or changed -> the run is only marked as re-checked (no LLM call)
+#   * new / changed sources   -> only the Final Verdict Synthesizer is re-run,
+#                                on the stored stage outputs plus those sources
+# Runs stored without a search log (e.g. from before it was recorded) fall back
+# to a full crew run.
+
+REFRESH_INTERVAL = float(os.getenv("FACTBOT_REFRESH_INTERVAL", "0"))    # seconds between scheduler passes, 0 = off
+REFRESH_MAX_AGE = float(os.getenv("FACTBOT_REFRESH_MAX_AGE", "3600"))   # re-check verdicts older than this
+REFRESH_WINDOW = float(os.getenv("FACTBOT_REFRESH_WINDOW", "86400"))    # how far back "hot" is measured
+REFRESH_MIN_CHECKS = int(os.getenv("FACTBOT_REFRESH_MIN_CHECKS", "2"))  # user checks needed to count as hot
+REFRESH_BATCH_SIZE = int(os.getenv("FACTBOT_REFRESH_BATCH_SIZE", "10"))  # claims refreshed per pass
+
+
+def evidence_index(searches):
+    """{canonical_url: evidence record} over every search of a run, first occurrence wins."""
+    index = {}
+    for search in searches:
+        for evidence in search.get("evidence", []):
+            index.setdefault(evidence["url"], evidence)
+    return index
+
+
+def diff_evidence(old_searches, new_searches):
+    """
+    Sources in `new_searches` that are new or whose snippet changed, as
+    `{"title", "url", "change", "snippet"}`; changed sources also carry the
+    `previous_snippet` when the stored run recorded it.
+    """
+    old_index = evidence_index(old_searches)
+    changes, seen = [], set()
+    for search in new_searches:
+        for evidence in search.get("evidence", []):
+            url = evidence["url"]
+            if url in seen:
+                continue
+            seen.add(url)
+            old = old_index.get(url)
+            if old is not None and old["snippet_hash"] == evidence["snippet_hash"]:
+                continue
+            change = {
+                "title": evidence["title"],
+                "url": evidence.get("link") or url,
+                "change": "new" if old is None else "changed",
+                "snippet": evidence.get("snippet", ""),
+            }
+            if old is not None and old.get("snippet"):
+                change["previous_snippet"] = old["snippet"]
+            changes.append(change)
+    return changes
+
+
+def reissue_searches(searches):
+    """Run the recorded queries again and return the new search log."""
+    # Bypass the search cache: the point is to see what the web says now
+    search_tool = RecordingSerperDevTool(use_cache=False)
+    issued = set()
+    for search in searches:
+        key = (search["query"], search.get("search_type", "search"), search.get("n_results", 3))
+        if not search["query"] or key in issued:
+            continue
+        issued.add(key)
+        search_tool.search(*key)
+    return search_tool.searches
+
+
+def refresh_run(run: Dict[str, Any], db_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Refresh one stored run. Returns `{"status", "run_id", "changes"}` where status is
+    'unchanged' (stored run re-checked in place), 'updated' (verdict re-synthesized)
+    or 'rerun' (full crew run, no search log was stored).
+    """
+    if not run.get("searches"):
+        new_run = run_fact_check(
+            run["claim"],
+            search_preset=run.get("search_preset") or DEFAULT_SEARCH_PRESET,
+            speculative=bool(run.get("speculative")),
+        )
+        new_run.update(mode="refresh", parent_run_id=run["id"])
+        return {"status": "rerun", "run_id": result_store.save_run(new_run, db_path), "changes": []}
+
+    new_searches = reissue_searches(run["searches"])
+    changes = diff_evidence(run["searches"], new_searches)
+
+    if not changes:
+        result_store.mark_checked(run["id"], db_path=db_path)
+        return {"status": "unchanged", "run_id": run["id"], "changes": []}
+
+    new_run = resynthesize_verdict(run["claim"], run["stage_outputs"], changes, new_searches)
+    # Same searches and stage outputs as the parent, so it answers the same preset
+    new_run.update(
+        mode="refresh", parent_run_id=run["id"], search_preset=run.get("search_preset"), speculative=run.get("speculative")
+    )
+    return {"status": "updated", "run_id": result_store.save_run(new_run, db_path), "changes": changes}
+
+
+def refresh_hot_claims(
+    max_age: float = REFRESH_MAX_AGE,
+    window: float = REFRESH_WINDOW,
+    min_checks: int = REFRESH_MIN_CHECKS,
+    limit: int = REFRESH_BATCH_SIZE,
+    db_path: Optional[str] = None,
+):
+    """Refresh the most-checked claims whose latest verdict is older than `max_age`."""
+    now = time.time()
+    outcomes = []
+    for claim in result_store.hot_claims(
+        since=now - window, min_checks=min_checks, stale_before=now - max_age, limit=limit, db_path=db_path
+    ):
+        run = result_store.get_run(claim["latest_run_id"], db_path)
+        try:
+            outcome = refresh_run(run, db_path)
+        except Exception as e:
+            # One failing claim (rate limit, LLM error) must not stop the rest of the batch
+            print(f"Refresh failed for run {run['id']}: {e}")
+            continue
+        print(f"Refreshed run {run['id']} ({run['claim'][:60]}): {outcome['status']}")
+        outcomes.append(outcome)
+    return outcomes
+
+
+class RefreshScheduler(threading.Thread):
+    """Daemon thread that runs `refresh_hot_claims` every `interval` seconds."""
+
+    def __init__(self, interval: float = REFRESH_INTERVAL, db_path: Optional[str] = None):
+        super().__init__(name="factbot-refresh", daemon=True)
+        self.interval = interval
+        self.db_path = db_path
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                refresh_hot_claims(db_path=self.db_path)
+            except Exception as e:
+                print(f"Refresh pass failed: {e}")
+
+    def stop(self):
+        self._stop_event.set()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-verify stored FactBot verdicts incrementally.")
+    parser.add_argument("--run-id", type=int, help="refresh a single stored run")
+    parser.add_argument("--loop", action="store_true", help="keep refreshing hot claims every FACTBOT_REFRESH_INTERVAL seconds")
+    args = parser.parse_args()
+
+    if args.run_id:
+        stored_run = result_store.get_run(args.run_id)
+        if not stored_run:
+            parser.error(f"No stored run with id {args.run_id}")
+        print(refresh_run(stored_run))
+    elif args.loop:
+        scheduler = RefreshScheduler(interval=REFRESH_INTERVAL or 600)
+        scheduler.start()
+        scheduler.join()
+    else:
+        refresh_hot_claims()
@@ -0,0 +1,420 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+# Local, embedded store for every fact-check run.
+# =============================================================================
+#
+# One SQLite file (WAL mode, so Streamlit sessions can read while a run is
+# being written) holding:
+#   * runs       - one row per run with the claim, verdict, timings and the raw
+#                  per-stage outputs of the crew
+#   * citations  - flattened supporting citations, indexed by domain
+#   * run_domains - one row per (cited domain, run), keyed in listing order so a
+#                  domain filter reads one page of the index, not every citation
+#   * runs_fts   - FTS5 index over the claim text (LIKE fallback when the
+#                  local SQLite build has no FTS5)
+#   * claim_checks - checks answered from a stored run instead of a new one
+#                  (worker verdict cache), so they still count towards hotness
+#
+# Listing uses keyset pagination on (created_at, id) so page N costs the same
+# as page 1, regardless of how many millions of rows are stored. Domain filters
+# walk `run_domains` in that same order. A full-text search first counts its
+# matches up to `FTS_CANDIDATE_LIMIT`: rarer terms are sorted from that bounded
+# candidate set, common ones filter the time-ordered scan row by row (they match
+# often enough that a page fills quickly).
+
+DB_PATH = os.getenv("FACTBOT_DB_PATH", "factbot_history.db")
+
+# Verdicts the Final Verdict Synthesizer is asked to produce
+VERDICTS = ["Verified", "Likely Verified", "Uncertain", "Likely Fake", "Fake"]
+
+# Searches matching fewer runs than this are sorted from the FTS matches directly
+FTS_CANDIDATE_LIMIT = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at      REAL NOT NULL,
+    claim           TEXT NOT NULL,
+    claim_key       TEXT NOT NULL,
+    verdict         TEXT,
+    total_sources   INTEGER,
+    execution_time  REAL,
+    report_json     TEXT NOT NULL,
+    stages_json     TEXT,
+    timings_json    TEXT,
+    searches_json   TEXT,
+    mode            TEXT NOT NULL DEFAULT 'full',
+    parent_run_id   INTEGER,
+    checked_at      REAL,
+    search_preset   TEXT,
+    speculative     INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_runs_created ON runs (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_runs_verdict_created ON runs (verdict, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_runs_claim_key ON runs (claim_key, created_at);
+
+CREATE TABLE IF NOT EXISTS citations (
+    run_id    INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    position  INTEGER NOT NULL,
+    title     TEXT,
+    url       TEXT,
+    domain    TEXT,
+    PRIMARY KEY (run_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_citations_domain ON citations (domain, run_id);
+
+CREATE TABLE IF NOT EXISTS run_domains (
+    domain      TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    run_id      INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    PRIMARY KEY (domain, created_at, run_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS claim_checks (
+    claim_key   TEXT NOT NULL,
+    checked_at  REAL NOT NULL,
+    run_id      INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_claim_checks_key ON claim_checks (claim_key, checked_at);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS runs_fts USING fts5(
+    claim, content='runs', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS runs_fts_ai AFTER INSERT ON runs BEGIN
+    INSERT INTO runs_fts (rowid, claim) VALUES (new.id, new.claim);
+END;
+CREATE TRIGGER IF NOT EXISTS runs_fts_ad AFTER DELETE ON runs BEGIN
+    INSERT INTO runs_fts (runs_fts, rowid, claim) VALUES ('delete', old.id, old.claim);
+END;
+"""
+
+# Columns added after the first release of the store; applied to older databases on open
+MIGRATIONS = {
+    "searches_json": "ALTER TABLE runs ADD COLUMN searches_json TEXT",
+    "mode": "ALTER TABLE runs ADD COLUMN mode TEXT NOT NULL DEFAULT 'full'",
+    "parent_run_id": "ALTER TABLE runs ADD COLUMN parent_run_id INTEGER",
+    "checked_at": "ALTER TABLE runs ADD COLUMN checked_at REAL",
+    "search_preset": "ALTER TABLE runs ADD COLUMN search_preset TEXT",
+    "speculative": "ALTER TABLE runs ADD COLUMN speculative INTEGER NOT NULL DEFAULT 0",
+}
+
+_init_lock = threading.Lock()
+_initialized = set()
+_fts_available = {}
+
+
+def normalize_claim(claim: str) -> str:
+    """Lower-cased, whitespace/punctuation-collapsed claim used as a lookup key."""
+    return " ".join(re.findall(r"\w+", claim.lower()))
+
+
+def citation_domain(url: str) -> str:
+    host = urlsplit(url or "").hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def _init_db(conn: sqlite3.Connection, db_path: str):
+    with _init_lock:
+        if db_path in _initialized:
+            return
+        backfill_domains = not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'run_domains'"
+        ).fetchone()
+        conn.executescript(SCHEMA)
+        if backfill_domains:
+            # Stores created before run_domains existed
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO run_domains (domain, created_at, run_id)
+                SELECT c.domain, r.created_at, c.run_id FROM citations c JOIN runs r ON r.id = c.run_id
+                WHERE c.domain != ''
+                """
+            )
+            conn.commit()
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(runs)")}
+        for column, statement in MIGRATIONS.items():
+            if column not in columns:
+                conn.execute(statement)
+        try:
+            conn.executescript(FTS_SCHEMA)
+            _fts_available[db_path] = True
+        except sqlite3.OperationalError:
+            # SQLite compiled without FTS5 - full-text search degrades to LIKE.
+            _fts_available[db_path] = False
+        _initialized.add(db_path)
+
+
+@contextmanager
+def connect(db_path: Optional[str] = None) -> Iterator[sqlite3.Connection]:
+    """Open a short-lived connection; SQLite connections are cheap and not thread-safe."""
+    db_path = db_path or DB_PATH
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        _init_db(conn, db_path)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def save_run(run: Dict[str, Any], db_path: Optional[str] = None) -> int:
+    """Persist a run as returned by `trigger_crew.run_fact_check`. Returns the run id."""
+    report = run.get("final_report") or {}
+    citations = report.get("supporting_citations") or []
+    total_sources = report.get("total_sources_checked")
+    created_at = run.get("started_at", time.time())
+
+    with connect(db_path) as conn:
+        cursor = conn.execute(
+            """
+            INSERT INTO runs (created_at, claim, claim_key, verdict, total_sources,
+                              execution_time, report_json, stages_json, timings_json,
+                              searches_json, mode, parent_run_id, checked_at,
+                              search_preset, speculative)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                created_at,
+                run["claim"],
+                normalize_claim(run["claim"]),
+                report.get("final_verdict"),
+                total_sources if isinstance(total_sources, int) else None,
+                run.get("timings", {}).get("total"),
+                json.dumps(report),
+                json.dumps(run.get("stage_outputs", {})),
+                json.dumps(run.get("timings", {})),
+                json.dumps(run.get("searches", [])),
+                run.get("mode", "full"),
+                run.get("parent_run_id"),
+                created_at,
+                run.get("search_preset"),
+                int(bool(run.get("speculative"))),
+            ),
+        )
+        run_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO citations (run_id, position, title, url, domain) VALUES (?, ?, ?, ?, ?)",
+            [
+                (run_id, i, c.get("title"), c.get("url"), citation_domain(c.get("url", "")))
+                for i, c in enumerate(citations)
+                if isinstance(c, dict)
+            ],
+        )
+        domains = {citation_domain(c.get("url", "")) for c in citations if isinstance(c, dict)}
+        conn.executemany(
+            "INSERT INTO run_domains (domain, created_at, run_id) VALUES (?, ?, ?)",
+            [(domain, created_at, run_id) for domain in domains if domain],
+        )
+    return run_id
+
+
+def _row_to_run(row: sqlite3.Row) -> Dict[str, Any]:
+    run = dict(row)
+    run["final_report"] = json.loads(run.pop("report_json"))
+    for column, key, empty in (
+        ("stages_json", "stage_outputs", {}),
+        ("timings_json", "timings", {}),
+        ("searches_json", "searches", []),
+    ):
+        if column in run:
+            value = run.pop(column)
+            run[key] = json.loads(value) if value else empty
+    return run
+
+
+def _fts_query(text: str) -> str:
+    # Quote every token so user input can never be parsed as FTS5 syntax.
+    tokens = re.findall(r"\w+", text)
+    return " ".join(f'"{token}"' for token in tokens)
+
+
+def _search_clause(conn: sqlite3.Connection, search: str, db_path: Optional[str]):
+    """WHERE clause (on `r`) for a claim search, picked by how many runs match."""
+    if not _fts_available.get(db_path or DB_PATH):
+        return "r.claim LIKE ?", f"%{search.strip()}%"
+    query = _fts_query(search)
+    if not query:
+        return None, None
+    (matches,) = conn.execute(
+        "SELECT COUNT(*) FROM (SELECT 1 FROM runs_fts WHERE runs_fts MATCH ? LIMIT ?)",
+        (query, FTS_CANDIDATE_LIMIT),
+    ).fetchone()
+    if matches < FTS_CANDIDATE_LIMIT:
+        return "r.id IN (SELECT rowid FROM runs_fts WHERE runs_fts MATCH ?)", query
+    return "EXISTS (SELECT 1 FROM runs_fts WHERE runs_fts MATCH ? AND rowid = r.id)", query
+
+
+def list_runs(
+    verdict: Optional[str] = None,
+    domain: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    search: Optional[str] = None,
+    before: Optional[tuple] = None,
+    limit: int = 20,
+    db_path: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Return up to `limit` runs, newest first, matching all given filters.
+    `before` is the (created_at, id) of the last row of the previous page.
+    Stage outputs are not loaded here; use `get_run` for the full record.
+    """
+    with connect(db_path) as conn:
+        # A domain filter drives the query from run_domains, otherwise runs are walked directly
+        if domain:
+            domain = domain.lower()
+            domain = domain[4:] if domain.startswith("www.") else domain
+            source = "run_domains d JOIN runs r ON r.id = d.run_id"
+            order = "d.created_at", "d.run_id"
+            clauses, params = ["d.domain = ?"], [domain]
+        else:
+            source = "runs r"
+            order = "r.created_at", "r.id"
+            clauses, params = [], []
+        if verdict:
+            clauses.append("r.verdict = ?")
+            params.append(verdict)
+        if since is not None:
+            clauses.append(f"{order[0]} >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append(f"{order[0]} < ?")
+            params.append(until)
+        if search and search.strip():
+            clause, param = _search_clause(conn, search, db_path)
+            if clause:
+                clauses.append(clause)
+                params.append(param)
+        if before is not None:
+            clauses.append(f"({order[0]}, {order[1]}) < (?, ?)")
+            params.extend(before)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = conn.execute(
+            f"""
+            SELECT r.id, r.created_at, r.claim, r.claim_key, r.verdict, r.total_sources,
+                   r.execution_time, r.report_json, r.timings_json, r.mode, r.parent_run_id,
+                   r.checked_at
+            FROM {source} {where}
+            ORDER BY {order[0]} DESC, {order[1]} DESC
+            LIMIT ?
+            """,
+            (*params, limit),
+        ).fetchall()
+    return [_row_to_run(row) for row in rows]
+
+
+def iter_runs(chunk_size: int = 1000, db_path: Optional[str] = None, **filters) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield every run matching `filters` (see `list_runs`), newest first, in lists
+    of at most `chunk_size`. Each chunk is a fresh keyset query, so memory stays
+    bounded no matter how many runs match.
+    """
+    before = None
+    while True:
+        chunk = list_runs(before=before, limit=chunk_size, db_path=db_path, **filters)
+        if not chunk:
+            return
+        yield chunk
+        before = (chunk[-1]["created_at"], chunk[-1]["id"])
+
+
+def get_run(run_id: int, db_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    with connect(db_path) as conn:
+        row = conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+    return _row_to_run(row) if row else None
+
+
+def latest_run_for_claim(
+    claim: str,
+    db_path: Optional[str] = None,
+    search_presets: Optional[List[str]] = None,
+    include_speculative: bool = True,
+    require_verdict: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """
+    Most recent stored run for the same (normalized) claim, if any, optionally
+    only among runs made with one of `search_presets`, not speculatively and/or
+    that reached a verdict.
+    """
+    clauses, params = ["claim_key = ?"], [normalize_claim(claim)]
+    if search_presets is not None:
+        clauses.append(f"search_preset IN ({', '.join('?' * len(search_presets))})")
+        params.extend(search_presets)
+    if not include_speculative:
+        clauses.append("speculative = 0")
+    if require_verdict:
+        clauses.append("verdict IS NOT NULL")
+    with connect(db_path) as conn:
+        row = conn.execute(
+            f"SELECT * FROM runs WHERE {' AND '.join(clauses)} ORDER BY created_at DESC LIMIT 1", params
+        ).fetchone()
+    return _row_to_run(row) if row else None
+
+
+def record_check(claim: str, run_id: int, checked_at: Optional[float] = None, db_path: Optional[str] = None):
+    """Record a check of `claim` that was answered with the stored run `run_id`."""
+    with connect(db_path) as conn:
+        conn.execute(
+            "INSERT INTO claim_checks (claim_key, checked_at, run_id) VALUES (?, ?, ?)",
+            (normalize_claim(claim), checked_at or time.time(), run_id),
+        )
+
+
+
+def mark_checked(run_id: int, checked_at: Optional[float] = None, db_path: Optional[str] = None):
+    """Record that a run's evidence was re-checked and found unchanged."""
+    with connect(db_path) as conn:
+        conn.execute("UPDATE runs SET checked_at = ? WHERE id = ?", (checked_at or time.time(), run_id))
+
+
+def hot_claims(
+    since: float,
+    min_checks: int = 2,
+    stale_before: Optional[float] = None,
+    limit: int = 20,
+    db_path: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Claims users checked at least `min_checks` times since `since`, most-checked
+    first, with the id of their latest run. Full runs and checks served from a
+    stored run (`record_check`) count; refresh runs do not.
+    With `stale_before`, only claims whose latest run was last checked earlier are returned.
+    """
+    with connect(db_path) as conn:
+        rows = conn.execute(
+            """
+            SELECT h.claim_key, h.checks, latest.id AS latest_run_id, latest.checked_at
+            FROM (
+                SELECT claim_key, COUNT(*) AS checks
+                FROM (
+                    SELECT claim_key FROM runs WHERE created_at >= ? AND mode = 'full'
+                    UNION ALL
+                    SELECT claim_key FROM claim_checks WHERE checked_at >= ?
+                )
+                GROUP BY claim_key
+                HAVING COUNT(*) >= ?
+            ) h
+            JOIN runs latest ON latest.id = (
+                SELECT id FROM runs WHERE claim_key = h.claim_key ORDER BY created_at DESC LIMIT 1
+            )
+            WHERE ? IS NULL OR COALESCE(latest.checked_at, latest.created_at) < ?
+            ORDER BY h.checks DESC
+            LIMIT ?
+            """,
+            (since, since, min_checks, stale_before, stale_before, limit),
+        ).fetchall()
+    return [dict(row) for row in rows]
@@ -0,0 +1,225 @@
+import hashlib
+import re
+import threading
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from crewai_tools import SerperDevTool
+from pydantic import PrivateAttr
+
+import shared_cache
+from citations import canonicalize_url, display_url
+
+# Search tools that remember what they were asked and what they found.
+# =============================================================================
+#
+# Every query issued by an agent is logged together with the canonical URLs it
+# returned, each snippet and a hash of it. The log is stored with the run, which is
+# what lets a later refresh re-issue exactly the same queries and tell new or
+# changed sources apart from the evidence the stored verdict was based on.
+
+# "3 hours ago — ", "Jun 5, 2025 — " etc. are stripped before hashing snippets,
+# otherwise every refresh would look like changed evidence.
+_SNIPPET_DATE_PREFIX = re.compile(
+    r"^\s*(\d+\s+\w+\s+ago|[A-Z][a-z]{2,8}\.?\s+\d{1,2},\s+\d{4}|\d{1,2}\s+[A-Z][a-z]{2,8}\s+\d{4})\s*[—\-·.]+\s*"
+)
+
+
+def snippet_hash(snippet: str) -> str:
+    snippet = _SNIPPET_DATE_PREFIX.sub("", snippet or "")
+    normalized = " ".join(snippet.lower().split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def evidence_from_results(results: Dict[str, Any]) -> List[Dict[str, str]]:
+    """
+    Flatten a Serper response into `{"url", "link", "title", "snippet", "snippet_hash"}`
+    records: `url` is the canonical key, `link` the published URL.
+    """
+    evidence = []
+    if not isinstance(results, dict):
+        return evidence
+
+    for section in ("organic", "news", "peopleAlsoAsk"):
+        for item in results.get(section) or []:
+            url = canonicalize_url(item.get("link", ""))
+            if url:
+                evidence.append({
+                    "url": url,
+                    "link": display_url(item.get("link", "")) or url,
+                    "title": item.get("title", ""),
+                    "snippet": item.get("snippet", ""),
+                    "snippet_hash": snippet_hash(item.get("snippet", "")),
+                })
+
+    return evidence
+
+
+# Quality/latency presets for the adaptive search policy:
+#   initial_results  - n_results of every first query
+#   max_results      - n_results a query is widened to when its results are inconclusive
+#   follow_up        - whether an extra "<query> fact check" search may be issued
+#   max_search_calls - hard cap on Serper calls per run, split between the agents
+#                      by SEARCH_BUDGET_SHARES
+SEARCH_PRESETS = {
+    "fast": {"initial_results": 3, "max_results": 3, "follow_up": False, "max_search_calls": 6},
+    "balanced": {"initial_results": 3, "max_results": 6, "follow_up": True, "max_search_calls": 10},
+    "thorough": {"initial_results": 5, "max_results": 10, "follow_up": True, "max_search_calls": 20},
+}
+DEFAULT_SEARCH_PRESET = "balanced"
+
+# Share of max_search_calls reserved for each searching crew stage, so content
+# analysis cannot spend the searches claim verification needs
+SEARCH_BUDGET_SHARES = {"content_analysis": 0.4, "claim_verification": 0.6}
+
+AUTHORITATIVE_DOMAINS = {
+    "snopes.com", "politifact.com", "factcheck.org", "fullfact.org", "leadstories.com",
+    "boomlive.in", "altnews.in", "factly.in", "pib.gov.in", "reuters.com", "apnews.com",
+    "afp.com", "bbc.com", "bbc.co.uk", "npr.org", "theguardian.com", "nytimes.com",
+    "washingtonpost.com", "thehindu.com", "who.int", "un.org", "nature.com", "science.org",
+}
+AUTHORITATIVE_SUFFIXES = (".gov", ".edu", ".int", ".mil", ".gov.in", ".nic.in", ".gov.uk", ".ac.uk", ".ac.in")
+
+_REFUTING_TERMS = re.compile(r"\b(false|fake|hoax|debunk\w*|misleading|no evidence|not true|fabricated|misinformation)\b", re.IGNORECASE)
+_CONFIRMING_TERMS = re.compile(r"\b(confirm\w*|verified|officially|announced|is true|approved)\b", re.IGNORECASE)
+
+
+def is_authoritative(url: str) -> bool:
+    host = urlsplit(url).hostname or ""
+    return any(host == domain or host.endswith("." + domain) for domain in AUTHORITATIVE_DOMAINS) or host.endswith(AUTHORITATIVE_SUFFIXES)
+
+
+def needs_deeper_search(results: Dict[str, Any]) -> bool:
+    """
+    True when a result page is inconclusive: no authoritative source among the
+    results, or some snippets refute the claim while others confirm it.
+    """
+    items = [item for section in ("organic", "news") for item in (results.get(section) or [])] if isinstance(results, dict) else []
+    if not items:
+        return True
+    if not any(is_authoritative(canonicalize_url(item.get("link", ""))) for item in items):
+        return True
+    snippets = [f"{item.get('title', '')} {item.get('snippet', '')}" for item in items]
+    refuting = any(_REFUTING_TERMS.search(snippet) for snippet in snippets)
+    confirming = any(_CONFIRMING_TERMS.search(snippet) and not _REFUTING_TERMS.search(snippet) for snippet in snippets)
+    return refuting and confirming
+
+
+def _merge_results(primary: Dict[str, Any], extra: Dict[str, Any]) -> Dict[str, Any]:
+    merged = dict(primary)
+    for section in ("organic", "news"):
+        seen = {canonicalize_url(item.get("link", "")) for item in merged.get(section) or []}
+        for item in extra.get(section) or []:
+            url = canonicalize_url(item.get("link", ""))
+            if url not in seen:
+                seen.add(url)
+                merged[section] = list(merged.get(section) or []) + [item]
+    return merged
+
+
+class RecordingSerperDevTool(SerperDevTool):
+    """`SerperDevTool` that keeps a log of the queries and evidence of the current run."""
+
+    # Serve repeated queries from the cross-process search cache (refreshes turn this off)
+    use_cache: bool = True
+
+    _searches: List[Dict[str, Any]] = PrivateAttr(default_factory=list)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def _run(self, **kwargs: Any) -> Any:
+        return self.search(kwargs.get("search_query") or kwargs.get("query"), kwargs.get("search_type", self.search_type))
+
+    def search(self, search_query: str, search_type: Optional[str] = None, n_results: Optional[int] = None) -> Dict[str, Any]:
+        """Run one Serper query with `n_results` (default: the tool's) and log it."""
+        search_type = search_type or self.search_type
+        n_results = n_results or self.n_results
+
+        cache_key = shared_cache.search_cache_key(search_query, search_type, n_results)
+        results = shared_cache.get_cached_search(cache_key) if self.use_cache else None
+        if results is None:
+            # A per-call copy keeps n_results thread-safe when agents search concurrently
+            tool = self if n_results == self.n_results else self.model_copy(update={"n_results": n_results})
+            shared_cache.acquire("serper")
+            results = SerperDevTool._run(tool, search_query=search_query, search_type=search_type)
+            shared_cache.put_cached_search(cache_key, results)
+
+        search = {
+            "query": search_query,
+            "search_type": search_type,
+            "n_results": n_results,
+            "evidence": evidence_from_results(results),
+        }
+        # Agents may search concurrently (async tasks), so guard the shared log
+        with self._lock:
+            self._searches.append(search)
+        return results
+
+    @property
+    def searches(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._searches)
+
+
+class AdaptiveSerperDevTool(RecordingSerperDevTool):
+    """
+    Starts every query shallow and only pays for more results when they are
+    inconclusive (see `needs_deeper_search`): first by widening `n_results`, then,
+    if the preset allows, with a "<query> fact check" follow-up. Serper calls are
+    capped per tool; give each crew stage its own tool with its `stage` so it gets
+    its share of the run's budget. Once the budget is spent the agent is told to conclude.
+    """
+
+    preset: str = DEFAULT_SEARCH_PRESET
+    # Key of SEARCH_BUDGET_SHARES; None means the whole per-run budget
+    stage: Optional[str] = None
+
+    _calls: int = PrivateAttr(default=0)
+
+    def __init__(self, preset: str = DEFAULT_SEARCH_PRESET, stage: Optional[str] = None, **kwargs: Any):
+        if preset not in SEARCH_PRESETS:
+            raise ValueError(f"Unknown search preset '{preset}'. Choose one of: {', '.join(SEARCH_PRESETS)}")
+        if stage is not None and stage not in SEARCH_BUDGET_SHARES:
+            raise ValueError(f"Unknown search stage '{stage}'. Choose one of: {', '.join(SEARCH_BUDGET_SHARES)}")
+        super().__init__(preset=preset, stage=stage, n_results=SEARCH_PRESETS[preset]["initial_results"], **kwargs)
+
+    @property
+    def max_search_calls(self) -> int:
+        budget = SEARCH_PRESETS[self.preset]["max_search_calls"]
+        return budget if self.stage is None else max(1, round(budget * SEARCH_BUDGET_SHARES[self.stage]))
+
+    def _take_call(self) -> bool:
+        with self._lock:
+            if self._calls >= self.max_search_calls:
+                return False
+            self._calls += 1
+            return True
+
+    @property
+    def search_calls(self) -> int:
+        return self._calls
+
+    def _run(self, **kwargs: Any) -> Any:
+        search_query = kwargs.get("search_query") or kwargs.get("query")
+        search_type = kwargs.get("search_type", self.search_type)
+        settings = SEARCH_PRESETS[self.preset]
+
+        if not self._take_call():
+            return {
+                "searchParameters": {"q": search_query, "type": search_type},
+                "organic": [],
+                "note": (
+                    f"Search budget for this task is exhausted ({self.max_search_calls} searches). "
+                    "Do not search again; base your answer on the results already gathered."
+                ),
+            }
+
+        results = self.search(search_query, search_type, settings["initial_results"])
+
+        if settings["max_results"] > settings["initial_results"] and needs_deeper_search(results) and self._take_call():
+            results = self.search(search_query, search_type, settings["max_results"])
+
+        if settings["follow_up"] and "fact check" not in search_query.lower() and needs_deeper_search(results) and self._take_call():
+            follow_up = self.search(f"{search_query} fact check", search_type, settings["max_results"])
+            results = _merge_results(results, follow_up)
+
+        return results
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+# On-disk state shared by every FactBot process on the box.
+# =============================================================================
+#
+# One SQLite file holds
+#   * search_cache  - Serper responses keyed by (query, type, n_results), with a TTL
+#   * rate_budgets  - token buckets, so all worker processes draw from a single
+#                     rate-limit budget instead of one budget each
+# WAL mode lets readers run alongside a writer; bucket updates run inside
+# BEGIN IMMEDIATE transactions, which serializes them across processes.
+
+CACHE_PATH = os.getenv("FACTBOT_CACHE_PATH", "factbot_cache.db")
+SEARCH_CACHE_TTL = float(os.getenv("FACTBOT_SEARCH_CACHE_TTL", "1800"))  # seconds, 0 = off
+
+# name -> (tokens added per second, bucket capacity)
+RATE_LIMITS = {
+    "serper": (float(os.getenv("FACTBOT_SERPER_RATE", "5")), float(os.getenv("FACTBOT_SERPER_BURST", "10"))),
+    "crew": (float(os.getenv("FACTBOT_CREW_RATE", "0.5")), float(os.getenv("FACTBOT_CREW_BURST", "4"))),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_cache (
+    key         TEXT PRIMARY KEY,
+    created_at  REAL NOT NULL,
+    results     TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_search_cache_created ON search_cache (created_at);
+
+CREATE TABLE IF NOT EXISTS rate_budgets (
+    name        TEXT PRIMARY KEY,
+    tokens      REAL NOT NULL,
+    updated_at  REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+_init_lock = threading.Lock()
+_initialized = set()
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a shared rate-limit budget has no token within the allowed wait."""
+
+
+@contextmanager
+def connect(cache_path: Optional[str] = None) -> Iterator[sqlite3.Connection]:
+    cache_path = cache_path or CACHE_PATH
+    # isolation_level=None: transactions are opened explicitly where they matter
+    conn = sqlite3.connect(cache_path, timeout=30, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with _init_lock:
+            if cache_path not in _initialized:
+                conn.executescript(SCHEMA)
+                _initialized.add(cache_path)
+        yield conn
+    finally:
+        conn.close()
+
+
+def search_cache_key(search_query: str, search_type: str, n_results: int) -> str:
+    normalized = " ".join((search_query or "").lower().split())
+    return hashlib.sha1(f"{search_type}|{n_results}|{normalized}".encode("utf-8")).hexdigest()
+
+
+def get_cached_search(key: str, ttl: float = SEARCH_CACHE_TTL, cache_path: Optional[str] = None) -> Optional[Any]:
+    if ttl <= 0:
+        return None
+    with connect(cache_path) as conn:
+        row = conn.execute(
+            "SELECT results FROM search_cache WHERE key = ? AND created_at >= ?", (key, time.time() - ttl)
+        ).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def put_cached_search(key: str, results: Any, cache_path: Optional[str] = None):
+    with connect(cache_path) as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO search_cache (key, created_at, results) VALUES (?, ?, ?)",
+            (key, time.time(), json.dumps(results)),
+        )
+
+
+def purge_search_cache(ttl: float = SEARCH_CACHE_TTL, cache_path: Optional[str] = None) -> int:
+    """Delete expired search results; returns the number of rows removed."""
+    with connect(cache_path) as conn:
+        return conn.execute("DELETE FROM search_cache WHERE created_at < ?", (time.time() - ttl,)).rowcount
+
+
+def acquire(name: str, timeout: float = 60.0, cache_path: Optional[str] = None):
+    """
+    Take one token from the shared `name` budget (see RATE_LIMITS), waiting for
+    refills up to `timeout` seconds. Buckets with a rate <= 0 are unlimited.
+    """
+    rate, capacity = RATE_LIMITS[name]
+    if rate <= 0:
+        return
+
+    deadline = time.monotonic() + timeout
+    while True:
+        with connect(cache_path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = conn.execute("SELECT tokens, updated_at FROM rate_budgets WHERE name = ?", (name,)).fetchone()
+                tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * rate)
+                granted = tokens >= 1
+                if granted:
+                    tokens -= 1
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_budgets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                    (name, tokens, now),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        if granted:
+            return
+        wait = (1 - tokens) / rate
+        if time.monotonic() + wait > deadline:
+            raise RateLimitTimeout(f"Shared '{name}' rate limit: no budget available within {timeout:.0f}s")
+        time.sleep(wait)
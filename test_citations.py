@@ -0,0 +1,70 @@
+import pytest
+
+from citations import canonicalize_url, dedupe_citations, display_url
+
+
+@pytest.mark.parametrize("url, canonical", [
+    ("https://example.com/a?utm_source=x&utm_medium=y&id=2", "https://example.com/a?id=2"),
+    ("https://example.com/a?fbclid=1&gclid=2", "https://example.com/a"),
+    ("https://example.com/a?b=2&a=1", "https://example.com/a?a=1&b=2"),
+    ("http://www.example.com/a/", "https://example.com/a"),
+    ("https://m.example.com/a#section", "https://example.com/a"),
+    ("https://example.com:443/a", "https://example.com/a"),
+    ("https://example.com:8080/a", "https://example.com:8080/a"),
+    ("https://example.com/story/amp", "https://example.com/story"),
+    ("https://example.com/story.amp", "https://example.com/story"),
+    ("example.com/a", "https://example.com/a"),
+    ("//example.com/a", "https://example.com/a"),
+])
+def test_canonicalize_url(url, canonical):
+    assert canonicalize_url(url) == canonical
+
+
+@pytest.mark.parametrize("url", [
+    "https://example-com.cdn.ampproject.org/c/s/example.com/story/amp",
+    "https://www.google.com/amp/s/example.com/story",
+    "https://google.co.in/amp/s/www.example.com/story/",
+])
+def test_amp_caches_are_unwrapped(url):
+    assert canonicalize_url(url) == "https://example.com/story"
+
+
+@pytest.mark.parametrize("url", [
+    "mailto:a@b.c",
+    "javascript:alert(1)",
+    "ftp://example.com/file",
+    # Malformed: non-numeric port, port out of range, unclosed IPv6 host
+    "https://example.com:abc/x",
+    "https://example.com:70000/x",
+    "http://[::1/x",
+])
+def test_non_http_urls_are_left_alone(url):
+    assert canonicalize_url(url) == url
+    assert display_url(url) == ""
+
+
+def test_display_url_only_drops_tracking_params():
+    assert display_url("http://www.example.com/amp?utm_source=x&q=a%20b&fbclid=1#top") == "http://www.example.com/amp?q=a%20b#top"
+    assert display_url("example.com/a") == "https://example.com/a"
+
+
+def test_dedupe_keeps_first_seen_url_and_first_title():
+    citations = dedupe_citations([
+        "http://www.example.com/a/amp?utm_source=feed",
+        {"title": "", "url": "https://example.com/a"},
+        {"title": "Story", "link": "https://example.com/a/"},
+        {"title": "Other", "url": "https://other.org/b"},
+    ])
+    assert citations == [
+        {"title": "Story", "url": "http://www.example.com/a/amp"},
+        {"title": "Other", "url": "https://other.org/b"},
+    ]
+
+
+def test_dedupe_drops_non_http_links():
+    citations = dedupe_citations(["mailto:a@b.c", "", None, 42, {"title": "T", "url": "https://example.com"}])
+    assert citations == [{"title": "T", "url": "https://example.com"}]
+
+
+def test_dedupe_fills_missing_titles():
+    assert dedupe_citations(["https://example.com/a"]) == [{"title": "No Title Available", "url": "https://example.com/a"}]
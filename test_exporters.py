@@ -0,0 +1,67 @@
+import csv
+import json
+
+import pytest
+
+import exporters
+import result_store
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "history.db")
+    for i in range(7):
+        result_store.save_run({
+            "claim": f"claim {i}",
+            "started_at": 100.0 + i // 2,  # equal timestamps across chunk boundaries
+            "final_report": {
+                "final_verdict": "Fake" if i % 2 else "Verified",
+                "recommendation": "r",
+                "supporting_citations": [{"title": "A", "url": f"https://www.a.org/{i}"}, {"title": "B", "url": "https://b.org"}],
+            },
+            "timings": {"content_analysis": 1.0, "claim_verification": 2.0, "final_verdict": 0.5, "total": 3.5},
+        }, path)
+    return path
+
+
+def test_iter_runs_yields_every_run_once_in_chunks(db_path):
+    chunks = list(result_store.iter_runs(chunk_size=3, db_path=db_path))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert len({run["id"] for chunk in chunks for run in chunk}) == 7
+
+
+def test_jsonl_export(db_path, tmp_path):
+    path = str(tmp_path / "runs.jsonl")
+    assert exporters.export_runs(path, chunk_size=3, db_path=db_path, verdict="Fake") == {"runs": 3, "citations": 6, "files": [path]}
+    records = [json.loads(line) for line in open(path, encoding="utf-8")]
+    assert {record["verdict"] for record in records} == {"Fake"}
+    assert records[0]["timing_claim_verification_s"] == 2.0
+    assert records[0]["citations"][0]["domain"] == "a.org"
+
+
+def test_csv_export_writes_runs_and_citation_tables(db_path, tmp_path):
+    path = str(tmp_path / "runs.csv")
+    summary = exporters.export_runs(path, chunk_size=2, db_path=db_path)
+    assert summary["files"] == [path, str(tmp_path / "runs_citations.csv")]
+
+    runs = list(csv.DictReader(open(path, encoding="utf-8")))
+    citations = list(csv.DictReader(open(summary["files"][1], encoding="utf-8")))
+    assert list(runs[0]) == list(exporters.RUN_COLUMNS)
+    assert len(runs) == 7 and len(citations) == 14
+    assert {row["run_id"] for row in citations} == {row["id"] for row in runs}
+
+
+def test_parquet_export(db_path, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "runs.parquet")
+    exporters.export_runs(path, chunk_size=3, db_path=db_path)
+    assert pq.ParquetFile(path).num_row_groups == 3
+    assert pq.read_table(path).column("timing_total_s").to_pylist() == [3.5] * 7
+    assert pq.read_table(str(tmp_path / "runs_citations.parquet")).num_rows == 14
+
+
+def test_unknown_format_or_verdict_fails_loudly(db_path, tmp_path):
+    with pytest.raises(ValueError, match="format"):
+        exporters.export_runs(str(tmp_path / "runs.xlsx"), db_path=db_path)
+    with pytest.raises(ValueError, match="verdict"):
+        exporters.export_runs(str(tmp_path / "runs.csv"), db_path=db_path, verdict="False")
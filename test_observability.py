@@ -0,0 +1,78 @@
+import logging
+import os
+
+import pytest
+
+import observability
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def records(monkeypatch):
+    handler = ListHandler()
+    logger = logging.getLogger("factbot.test")
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    monkeypatch.setattr(observability, "get_logger", lambda: logger)
+    return handler.records
+
+
+def trace(monkeypatch, level, sample_rate):
+    monkeypatch.setattr(observability, "OBSERVABILITY_LEVEL", level)
+    monkeypatch.setattr(observability, "TRACE_SAMPLE_RATE", sample_rate)
+    return observability.RunTrace("Moon is cheese")
+
+
+def test_sampling_by_level(monkeypatch):
+    assert trace(monkeypatch, "sampled", 1.0).sampled
+    assert not trace(monkeypatch, "sampled", 0.0).sampled
+    assert trace(monkeypatch, "full", 0.0).sampled
+    summary_only = trace(monkeypatch, "summary", 1.0)
+    summary_only.record_step("step")
+    assert not summary_only.sampled and summary_only.events == []
+
+
+def test_unsampled_trace_is_kept_only_when_the_run_fails(monkeypatch, records):
+    for error in (None, RuntimeError("boom")):
+        run = trace(monkeypatch, "sampled", 0.0)
+        run.record_task("content_analysis", "output")
+        run.finish(error=error)
+
+    assert [record.getMessage() for record in records] == ["run", "trace", "run"]
+    ok, failed = records[0].fields, records[2].fields
+    assert not ok["trace_kept"] and ok["status"] == "ok"
+    assert failed["trace_kept"] and failed["status"] == "failed" and failed["error"] == "RuntimeError: boom"
+    assert records[1].fields["task"] == "content_analysis"
+
+
+def test_trace_buffer_and_fields_are_capped(monkeypatch, records):
+    monkeypatch.setattr(observability, "TRACE_MAX_BYTES", 1000)
+    run = trace(monkeypatch, "full", 0.0)
+    for _ in range(20):
+        run.record_task("claim_verification", "x" * 100)
+    run.finish()
+
+    summary = records[-1].fields
+    assert 0 < summary["trace_bytes"] <= 1000
+    assert summary["trace_events"] + summary["trace_dropped_events"] == 20
+    assert len(records) == summary["trace_events"] + 1
+    assert run.events == []
+
+    assert observability.truncate("abcdef", 3) == "abc... [truncated 3 chars]"
+    assert observability.truncate("abc", 3) == "abc"
+
+
+def test_each_process_writes_its_own_log_file(monkeypatch):
+    monkeypatch.setattr(observability, "LOG_FILE", os.path.join("logs", "factbot.log"))
+    assert observability.process_log_file(42) == os.path.join("logs", "factbot.42.log")
+    assert observability.process_log_file() == os.path.join("logs", f"factbot.{os.getpid()}.log")
@@ -0,0 +1,93 @@
+import refresh
+import result_store
+from search_tools import evidence_from_results, snippet_hash
+
+
+def search_log(*items, query="moon cheese"):
+    results = {"organic": [{"title": title, "link": link, "snippet": snippet} for title, link, snippet in items]}
+    return [{"query": query, "search_type": "search", "n_results": 3, "evidence": evidence_from_results(results)}]
+
+
+def test_snippet_hash_ignores_date_prefix_and_whitespace():
+    assert snippet_hash("3 hours ago — The Moon is  rock.") == snippet_hash("Jun 5, 2025 — the moon is rock.")
+    assert snippet_hash("The Moon is rock.") != snippet_hash("The Moon is cheese.")
+
+
+def test_evidence_keeps_published_link_and_snippet():
+    [evidence] = search_log(("NASA", "http://www.nasa.gov/moon?utm_source=x", "Rock."))[0]["evidence"]
+    assert evidence["url"] == "https://nasa.gov/moon"
+    assert evidence["link"] == "http://www.nasa.gov/moon"
+    assert evidence["snippet"] == "Rock."
+
+
+def test_diff_evidence_reports_new_and_changed_sources_with_snippets():
+    old = search_log(("NASA", "https://nasa.gov/moon", "The Moon is rock."), ("Blog", "https://blog.example/moon", "Cheese?"))
+    new = search_log(
+        ("NASA", "https://www.nasa.gov/moon/", "1 day ago — The Moon is rock."),  # same source, same snippet
+        ("Blog", "https://blog.example/moon", "Cheese, confirmed!"),
+        ("Reuters", "https://reuters.com/moon", "Fact check: not cheese."),
+    )
+    assert refresh.diff_evidence(old, new) == [
+        {"title": "Blog", "url": "https://blog.example/moon", "change": "changed",
+         "snippet": "Cheese, confirmed!", "previous_snippet": "Cheese?"},
+        {"title": "Reuters", "url": "https://reuters.com/moon", "change": "new", "snippet": "Fact check: not cheese."},
+    ]
+
+
+def test_diff_evidence_handles_logs_stored_without_snippets():
+    old = search_log(("Blog", "https://blog.example/moon", "Cheese?"))
+    for evidence in old[0]["evidence"]:
+        del evidence["snippet"], evidence["link"]
+    [change] = refresh.diff_evidence(old, search_log(("Blog", "https://blog.example/moon", "Cheese, confirmed!")))
+    assert change["change"] == "changed" and change["snippet"] == "Cheese, confirmed!"
+    assert "previous_snippet" not in change
+
+
+def test_refresh_run_unchanged_and_updated(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "history.db")
+    searches = search_log(("NASA", "https://nasa.gov/moon", "The Moon is rock."))
+    run_id = result_store.save_run({
+        "claim": "Moon is made of cheese", "started_at": 100.0,
+        "final_report": {"final_verdict": "Fake", "supporting_citations": [], "total_sources_checked": 0},
+        "stage_outputs": {}, "timings": {}, "searches": searches,
+    }, db_path)
+    run = result_store.get_run(run_id, db_path)
+
+    monkeypatch.setattr(refresh, "reissue_searches", lambda _: searches)
+    assert refresh.refresh_run(run, db_path)["status"] == "unchanged"
+    assert result_store.get_run(run_id, db_path)["checked_at"] > 100.0
+
+    changed = search_log(("NASA", "https://nasa.gov/moon", "The Moon is, in fact, cheese."))
+    seen = {}
+
+    def fake_resynthesize(claim, stage_outputs, evidence_changes, new_searches):
+        seen["changes"] = evidence_changes
+        return {"claim": claim, "final_report": {"final_verdict": "Uncertain"}, "stage_outputs": {}, "timings": {}, "searches": new_searches}
+
+    monkeypatch.setattr(refresh, "reissue_searches", lambda _: changed)
+    monkeypatch.setattr(refresh, "resynthesize_verdict", fake_resynthesize)
+    outcome = refresh.refresh_run(run, db_path)
+    assert outcome["status"] == "updated"
+    assert seen["changes"][0]["snippet"] == "The Moon is, in fact, cheese."
+    assert seen["changes"][0]["previous_snippet"] == "The Moon is rock."
+    assert result_store.get_run(outcome["run_id"], db_path)["parent_run_id"] == run_id
+
+
+def test_rerun_keeps_the_parent_search_preset(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "history.db")
+    run_id = result_store.save_run({
+        "claim": "Moon is made of cheese", "started_at": 100.0,
+        "final_report": {"final_verdict": "Fake", "supporting_citations": []},
+        "search_preset": "thorough", "speculative": True,
+    }, db_path)
+    seen = {}
+
+    def fake_run_fact_check(claim, search_preset, speculative):
+        seen.update(search_preset=search_preset, speculative=speculative)
+        return {"claim": claim, "final_report": {"final_verdict": "Fake"}, "search_preset": search_preset, "speculative": speculative}
+
+    monkeypatch.setattr(refresh, "run_fact_check", fake_run_fact_check)
+    outcome = refresh.refresh_run(result_store.get_run(run_id, db_path), db_path)
+    assert outcome["status"] == "rerun"
+    assert seen == {"search_preset": "thorough", "speculative": True}
+    assert result_store.get_run(outcome["run_id"], db_path)["search_preset"] == "thorough"
@@ -0,0 +1,90 @@
+import pytest
+
+import result_store
+
+
+def make_run(claim, created_at, verdict="Fake", urls=()):
+    return {
+        "claim": claim,
+        "started_at": created_at,
+        "final_report": {
+            "final_verdict": verdict,
+            "supporting_citations": [{"title": url, "url": url} for url in urls],
+            "total_sources_checked": len(urls),
+        },
+        "stage_outputs": {"content_analysis": "{}"},
+        "timings": {"total": 1.0},
+        "searches": [],
+    }
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "history.db")
+
+
+def test_save_and_get_run(db_path):
+    run_id = result_store.save_run(make_run("Moon is made of cheese", 100.0, urls=["https://www.nasa.gov/moon"]), db_path)
+    run = result_store.get_run(run_id, db_path)
+    assert run["claim"] == "Moon is made of cheese"
+    assert run["verdict"] == "Fake"
+    assert run["total_sources"] == 1
+    assert run["stage_outputs"] == {"content_analysis": "{}"}
+    assert run["mode"] == "full"
+
+
+def test_keyset_pages_cover_equal_timestamps_exactly_once(db_path):
+    # Several runs share a created_at: the id tie-breaker must not skip or repeat any
+    ids = [result_store.save_run(make_run(f"claim {i}", 100.0 + i // 3), db_path) for i in range(10)]
+
+    seen, before = [], None
+    while True:
+        page = result_store.list_runs(before=before, limit=4, db_path=db_path)
+        if not page:
+            break
+        seen.extend(run["id"] for run in page)
+        before = (page[-1]["created_at"], page[-1]["id"])
+
+    assert sorted(seen) == sorted(ids)
+    assert len(seen) == len(set(seen))
+    created = [result_store.get_run(run_id, db_path)["created_at"] for run_id in seen]
+    assert created == sorted(created, reverse=True)
+
+
+def test_filters(db_path):
+    result_store.save_run(make_run("G20 summit hosted by India", 100.0, "Fake", ["https://www.reuters.com/g20"]), db_path)
+    result_store.save_run(make_run("Chocolate improves memory", 200.0, "Uncertain", ["https://bbc.com/choc"]), db_path)
+    result_store.save_run(make_run("G20 summit moved online", 300.0, "Verified", ["https://reuters.com/online"]), db_path)
+
+    def claims(**filters):
+        return [run["claim"] for run in result_store.list_runs(db_path=db_path, **filters)]
+
+    assert claims(verdict="Fake") == ["G20 summit hosted by India"]
+    assert claims(domain="www.reuters.com") == ["G20 summit moved online", "G20 summit hosted by India"]
+    assert claims(search="summit") == ["G20 summit moved online", "G20 summit hosted by India"]
+    assert claims(since=150.0, until=300.0) == ["Chocolate improves memory"]
+    assert claims(search="summit", verdict="Verified") == ["G20 summit moved online"]
+
+
+def test_latest_run_for_claim_ignores_case_and_punctuation(db_path):
+    result_store.save_run(make_run("Is the Moon made of cheese?", 100.0), db_path)
+    newest = result_store.save_run(make_run("is the moon made of cheese", 200.0), db_path)
+    assert result_store.latest_run_for_claim("IS THE MOON MADE OF CHEESE!", db_path)["id"] == newest
+
+
+def test_common_searches_filter_the_time_ordered_scan(db_path, monkeypatch):
+    for i in range(6):
+        result_store.save_run(make_run(f"summit number {i}", 100.0 + i, urls=["https://reuters.com/x", "https://www.reuters.com/y"]), db_path)
+    rare = [run["claim"] for run in result_store.list_runs(search="summit", limit=3, db_path=db_path)]
+    monkeypatch.setattr(result_store, "FTS_CANDIDATE_LIMIT", 2)
+    assert [run["claim"] for run in result_store.list_runs(search="summit", limit=3, db_path=db_path)] == rare
+    # Two citations of one domain list the run once
+    assert len(result_store.list_runs(domain="reuters.com", search="summit", db_path=db_path)) == 6
+
+
+def test_domain_index_is_backfilled_for_older_stores(db_path):
+    result_store.save_run(make_run("G20 summit", 100.0, urls=["https://reuters.com/g20"]), db_path)
+    with result_store.connect(db_path) as conn:
+        conn.execute("DROP TABLE run_domains")
+    result_store._initialized.discard(db_path)
+    assert [run["claim"] for run in result_store.list_runs(domain="reuters.com", db_path=db_path)] == ["G20 summit"]
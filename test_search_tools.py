@@ -0,0 +1,77 @@
+import pytest
+
+import search_tools
+import shared_cache
+
+
+def page(*links, snippet=""):
+    return {"organic": [{"title": link, "link": link, "snippet": snippet} for link in links]}
+
+
+@pytest.fixture
+def serper_calls(monkeypatch, tmp_path):
+    """Stub Serper: 'moon' queries only find a blog, anything else finds Reuters."""
+    calls = []
+
+    def fake_run(tool, search_query, search_type):
+        calls.append((search_query, tool.n_results))
+        return page("https://blog.example/moon") if "moon" in search_query else page("https://www.reuters.com/g20")
+
+    monkeypatch.setenv("SERPER_API_KEY", "test")
+    monkeypatch.setattr(search_tools.SerperDevTool, "_run", fake_run)
+    monkeypatch.setattr(shared_cache, "acquire", lambda name, timeout=60.0: None)
+    # Fresh results are still written to the cache
+    monkeypatch.setattr(shared_cache, "CACHE_PATH", str(tmp_path / "cache.db"))
+    return calls
+
+
+def test_is_authoritative():
+    assert search_tools.is_authoritative("https://www.reuters.com/world")
+    assert search_tools.is_authoritative("https://data.gov/x") and search_tools.is_authoritative("https://pib.gov.in/x")
+    assert not search_tools.is_authoritative("https://notreuters.com/world")
+    assert not search_tools.is_authoritative("https://blog.example/moon")
+
+
+def test_needs_deeper_search():
+    assert search_tools.needs_deeper_search({})
+    assert search_tools.needs_deeper_search(page("https://blog.example/moon"))
+    assert not search_tools.needs_deeper_search(page("https://reuters.com/g20", snippet="Officially announced"))
+    # Authoritative, but the snippets disagree
+    conflicting = page("https://reuters.com/g20", snippet="Officially announced")
+    conflicting["organic"].append({"title": "", "link": "https://blog.example/g20", "snippet": "This is a hoax"})
+    assert search_tools.needs_deeper_search(conflicting)
+
+
+def test_merge_results_skips_duplicate_urls():
+    merged = search_tools._merge_results(
+        page("https://reuters.com/a"), page("https://www.reuters.com/a/?utm_source=x", "https://apnews.com/b")
+    )
+    assert [item["link"] for item in merged["organic"]] == ["https://reuters.com/a", "https://apnews.com/b"]
+
+
+def test_inconclusive_queries_are_widened_then_followed_up(serper_calls):
+    tool = search_tools.AdaptiveSerperDevTool(preset="balanced", stage="claim_verification", use_cache=False)
+    tool._run(search_query="G20 summit")
+    assert serper_calls == [("G20 summit", 3)]
+
+    tool._run(search_query="moon cheese")
+    assert serper_calls[1:] == [("moon cheese", 3), ("moon cheese", 6), ("moon cheese fact check", 6)]
+    assert [search["query"] for search in tool.searches] == ["G20 summit", "moon cheese", "moon cheese", "moon cheese fact check"]
+
+
+def test_each_stage_has_its_own_budget(serper_calls):
+    analysis = search_tools.AdaptiveSerperDevTool(preset="balanced", stage="content_analysis", use_cache=False)
+    verification = search_tools.AdaptiveSerperDevTool(preset="balanced", stage="claim_verification", use_cache=False)
+    assert (analysis.max_search_calls, verification.max_search_calls) == (4, 6)
+
+    analysis._run(search_query="moon cheese")
+    analysis._run(search_query="moon rock")
+    exhausted = analysis._run(search_query="moon dust")
+    assert analysis.search_calls == 4 and len(serper_calls) == 4
+    assert exhausted["organic"] == [] and "exhausted (4 searches)" in exhausted["note"]
+
+    verification._run(search_query="G20 summit")
+    assert verification.search_calls == 1
+
+    with pytest.raises(ValueError, match="stage"):
+        search_tools.AdaptiveSerperDevTool(stage="final_verdict")
@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+import shared_cache
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache.db")
+
+
+def test_search_cache_key_normalizes_query():
+    assert shared_cache.search_cache_key("  Moon  CHEESE ", "search", 3) == shared_cache.search_cache_key("moon cheese", "search", 3)
+    assert shared_cache.search_cache_key("moon cheese", "search", 3) != shared_cache.search_cache_key("moon cheese", "search", 6)
+    assert shared_cache.search_cache_key("moon cheese", "search", 3) != shared_cache.search_cache_key("moon cheese", "news", 3)
+
+
+def test_search_cache_ttl(cache_path):
+    key = shared_cache.search_cache_key("moon", "search", 3)
+    shared_cache.put_cached_search(key, {"organic": [1]}, cache_path=cache_path)
+    assert shared_cache.get_cached_search(key, ttl=60, cache_path=cache_path) == {"organic": [1]}
+    assert shared_cache.get_cached_search(key, ttl=0, cache_path=cache_path) is None
+
+    with shared_cache.connect(cache_path) as conn:
+        conn.execute("UPDATE search_cache SET created_at = created_at - 120")
+    assert shared_cache.get_cached_search(key, ttl=60, cache_path=cache_path) is None
+    assert shared_cache.purge_search_cache(ttl=60, cache_path=cache_path) == 1
+
+
+def test_token_bucket_allows_burst_then_waits_for_refill(cache_path, monkeypatch):
+    monkeypatch.setitem(shared_cache.RATE_LIMITS, "serper", (20.0, 3.0))
+    start = time.monotonic()
+    for _ in range(3):
+        shared_cache.acquire("serper", cache_path=cache_path)
+    assert time.monotonic() - start < 0.05
+
+    shared_cache.acquire("serper", cache_path=cache_path)
+    assert time.monotonic() - start >= 0.04  # one token refills in 1/20 s
+
+
+def test_token_bucket_times_out(cache_path, monkeypatch):
+    monkeypatch.setitem(shared_cache.RATE_LIMITS, "crew", (0.01, 1.0))
+    shared_cache.acquire("crew", cache_path=cache_path)
+    with pytest.raises(shared_cache.RateLimitTimeout):
+        shared_cache.acquire("crew", timeout=0.1, cache_path=cache_path)
+
+
+def test_non_positive_rate_is_unlimited(cache_path, monkeypatch):
+    monkeypatch.setitem(shared_cache.RATE_LIMITS, "crew", (0.0, 1.0))
+    for _ in range(100):
+        shared_cache.acquire("crew", timeout=0, cache_path=cache_path)
@@ -0,0 +1,87 @@
+import pytest
+
+import shared_cache
+import trigger_crew
+
+
+class RecordingTrace:
+    finished = []
+
+    def __init__(self, claim, kind="fact_check"):
+        pass
+
+    def record_step(self, step):
+        pass
+
+    def finish(self, report=None, timings=None, error=None):
+        RecordingTrace.finished.append(error)
+
+
+def test_setup_failures_finish_the_trace(monkeypatch):
+    def no_budget(name, timeout=60.0):
+        raise shared_cache.RateLimitTimeout("no budget")
+
+    monkeypatch.setattr(trigger_crew, "RunTrace", RecordingTrace)
+    monkeypatch.setattr(shared_cache, "acquire", no_budget)
+    RecordingTrace.finished = []
+
+    with pytest.raises(shared_cache.RateLimitTimeout):
+        trigger_crew.run_fact_check("Moon is cheese")
+    with pytest.raises(shared_cache.RateLimitTimeout):
+        trigger_crew.resynthesize_verdict("Moon is cheese", {}, [], [])
+    assert [type(error) for error in RecordingTrace.finished] == [shared_cache.RateLimitTimeout] * 2
+
+
+def speculative_outputs():
+    content_analysis = {
+        "inferred_core_claims_keywords": ["India hosts G20 summit 2025"],
+        "supporting_urls_for_input_verification": [{"title": "Reuters", "link": "https://www.reuters.com/g20"}],
+    }
+    verification = {
+        "claims_verified_details": [
+            {"claim_text": "India hosts the G20 summit in 2025", "supporting_urls": ["https://snopes.com/g20", "https://shared.org/x"]},
+            {"claim_text": "Cricket world cup moved to Mars", "supporting_urls": ["http://offtopic.com/mars/", "https://shared.org/x"]},
+        ],
+        "all_verification_sources_consulted": [
+            {"title": "Snopes", "link": "https://snopes.com/g20"},
+            {"title": "Off topic", "link": "https://offtopic.com/mars"},
+            {"title": "Shared", "link": "https://shared.org/x"},
+            {"title": "Uncited", "link": "https://uncited.org"},
+        ],
+    }
+    return content_analysis, verification
+
+
+def test_reconcile_discards_unrelated_claims_and_their_only_sources():
+    content_analysis, verification = speculative_outputs()
+    counts = trigger_crew.reconcile_speculative_verification(content_analysis, verification)
+
+    assert counts == {"discarded_claims": 1, "discarded_sources": 1, "uncovered_claims": []}
+    assert [claim["claim_text"] for claim in verification["claims_verified_details"]] == ["India hosts the G20 summit in 2025"]
+    # Kept: cited by a kept claim, by a discarded and a kept claim, or by no claim at all
+    assert [source["title"] for source in verification["all_verification_sources_consulted"]] == ["Snopes", "Shared", "Uncited"]
+    assert "claims_not_verified" not in verification
+
+
+def test_reconcile_keeps_everything_when_nothing_matches():
+    content_analysis, verification = speculative_outputs()
+    content_analysis["inferred_core_claims_keywords"] = []
+    counts = trigger_crew.reconcile_speculative_verification(content_analysis, verification)
+
+    assert counts == {"discarded_claims": 0, "discarded_sources": 0, "uncovered_claims": []}
+    assert len(verification["claims_verified_details"]) == 2
+    assert len(verification["all_verification_sources_consulted"]) == 4
+
+
+def test_reconcile_matches_extracted_claims_not_the_headline():
+    content_analysis = {"inferred_core_claims_keywords": ["Delhi summit cancelled", "Prime minister resigned"]}
+    verification = {"claims_verified_details": [
+        {"claim_text": "Summit in Delhi", "supporting_urls": []},        # shares "summit" and "delhi"
+        {"claim_text": "Summit attendance record", "supporting_urls": []},  # shares only "summit"
+        {"claim_text": "Delhi", "supporting_urls": []},                  # single-term claim, one match is enough
+    ]}
+    counts = trigger_crew.reconcile_speculative_verification(content_analysis, verification)
+
+    assert [claim["claim_text"] for claim in verification["claims_verified_details"]] == ["Summit in Delhi", "Delhi"]
+    # Nothing speculative covered the second extracted claim; it is flagged, not searched again
+    assert counts["uncovered_claims"] == verification["claims_not_verified"] == ["Prime minister resigned"]
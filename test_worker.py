@@ -0,0 +1,105 @@
+import os
+import stat
+import time
+
+import pytest
+
+import result_store
+import worker
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "history.db")
+    monkeypatch.setattr(result_store, "DB_PATH", path)
+    return path
+
+
+def save(claim, search_preset, speculative=False, created_at=None):
+    return result_store.save_run({
+        "claim": claim,
+        "started_at": created_at or time.time(),
+        "final_report": {"final_verdict": "Fake", "supporting_citations": [], "total_sources_checked": 0},
+        "search_preset": search_preset,
+        "speculative": speculative,
+    })
+
+
+def test_parse_address():
+    assert worker.parse_address("127.0.0.1:8765") == ("127.0.0.1", 8765)
+    assert worker.parse_address("/tmp/factbot.sock") == "/tmp/factbot.sock"
+    assert worker.parse_address("~/w.sock") == os.path.expanduser("~/w.sock")
+
+
+def test_cached_run_needs_at_least_the_requested_depth(db_path):
+    fast = save("Moon is cheese", "fast")
+    assert worker.cached_run("moon is cheese", "fast", False)["id"] == fast
+    assert worker.cached_run("moon is cheese", "thorough", False) is None
+
+    thorough = save("Moon is cheese", "thorough")
+    assert worker.cached_run("moon is cheese", "balanced", False)["id"] == thorough
+
+
+def test_speculative_runs_only_answer_speculative_requests(db_path):
+    speculative = save("Moon is cheese", "balanced", speculative=True)
+    assert worker.cached_run("Moon is cheese", "balanced", False) is None
+    assert worker.cached_run("Moon is cheese", "balanced", True)["id"] == speculative
+
+
+def test_cached_run_respects_ttl(db_path, monkeypatch):
+    save("Moon is cheese", "balanced", created_at=time.time() - 3600)
+    monkeypatch.setattr(worker, "VERDICT_CACHE_TTL", 60)
+    assert worker.cached_run("Moon is cheese", "balanced", False) is None
+
+
+def test_cache_hits_count_towards_hotness(db_path):
+    run_id = save("Moon is cheese", "balanced")
+    for _ in range(2):
+        response = worker.execute_request({"claim": "Moon is cheese", "search_preset": "balanced"})
+        assert response["ok"] and response["cached"] and response["run_id"] == run_id
+
+    [hot] = result_store.hot_claims(since=time.time() - 60, min_checks=3)
+    assert hot["checks"] == 3 and hot["latest_run_id"] == run_id
+
+
+def test_authkey_file_is_generated_private(tmp_path, monkeypatch):
+    monkeypatch.delenv("FACTBOT_WORKER_AUTHKEY", raising=False)
+    monkeypatch.setattr(worker, "WORKER_DIR", str(tmp_path / "factbot"))
+    monkeypatch.setattr(worker, "WORKER_AUTHKEY_FILE", str(tmp_path / "factbot" / "worker.key"))
+
+    with pytest.raises(RuntimeError):
+        worker.load_authkey()
+    key = worker.load_authkey(create=True)
+    assert len(key) == 64 and key != b"factbot"
+    assert worker.load_authkey() == key
+    assert stat.S_IMODE(os.stat(worker.WORKER_AUTHKEY_FILE).st_mode) == 0o600
+
+
+def test_server_refuses_public_tcp_without_explicit_key(monkeypatch):
+    monkeypatch.delenv("FACTBOT_WORKER_AUTHKEY", raising=False)
+    with pytest.raises(RuntimeError, match="FACTBOT_WORKER_AUTHKEY"):
+        worker.WorkerServer("0.0.0.0:8765", 1)
+    assert worker.is_loopback(("127.0.0.1", 8765)) and worker.is_loopback("/tmp/w.sock")
+    assert not worker.is_loopback(("0.0.0.0", 8765))
+
+
+def test_runs_without_a_verdict_are_not_served(db_path):
+    result_store.save_run({"claim": "Moon is cheese", "final_report": {}, "search_preset": "balanced"})
+    assert worker.cached_run("Moon is cheese", "balanced", False) is None
+
+
+def test_server_replaces_a_broken_pool(tmp_path, db_path, monkeypatch):
+    # Spawned workers read the store location from the environment
+    monkeypatch.setenv("FACTBOT_DB_PATH", db_path)
+    server = worker.WorkerServer(str(tmp_path / "w.sock"), 1, stub_crew={"latency": 0.0, "cpu_ms": 0}, authkey=b"test")
+    try:
+        assert server.submit({"claim": "Moon is cheese"})["ok"]
+        for process in list(server.pool._processes.values()):
+            process.kill()
+            process.join()
+
+        response = server.submit({"claim": "Moon is cheese"})
+        assert not response["ok"] and response["error"].startswith("BrokenProcessPool")
+        assert server.submit({"claim": "Moon is cheese"})["ok"]
+    finally:
+        server.close()
@@ -1,15 +1,65 @@
 from crewai import Crew, LLM, Agent, Task
-from crewai_tools import SerperDevTool
 
-from dotenv import load_dotenv
-load_dotenv()
+from citations import canonicalize_url, dedupe_citations
+from search_tools import AdaptiveSerperDevTool, DEFAULT_SEARCH_PRESET
+from observability import RunTrace, crew_verbose
+import shared_cache
 
 import json
 import os
 import re 
+import threading
 
 import time 
 
+from dotenv import load_dotenv
+load_dotenv()
+
+CREW_VERBOSE = crew_verbose() # CrewAI console output only at FACTBOT_OBSERVABILITY=verbose
+
+# Speculative mode: claim verification starts on the raw headline alongside content analysis (see `run_fact_check`)
+SPECULATIVE_EXECUTION = os.getenv("FACTBOT_SPECULATIVE", "0") == "1"
+
+FINAL_VERDICT_DESCRIPTION = """
+            Your final task is to synthesize all analytical insights to provide a comprehensive, actionable verdict on the news item, **explicitly and primarily addressing the veracity of the user's original input headline: "{news_headline_or_topic}"**.
+
+            Instructions:
+            1.  Core Verdict Determination (Highest Priority):
+                * If 'input_headline_direct_verification_status' is 'debunked'**: The `final_verdict` **MUST be "Fake"**. The `verdict_reasoning` must clearly state that the input claim is false and provide the 'correct_information_if_debunked' from the Content Analysis Master.
+                * If 'input_headline_direct_verification_status' is 'verified'**:
+                    * If 'inferred_sensationalism_level' is 'high' OR 'overall_inferred_strong_bias' is true: "Likely Verified" (suggesting caution despite factual accuracy).
+                    * Otherwise: "Verified".
+                * If 'input_headline_direct_verification_status' is 'unverifiable'**: "Uncertain". The reasoning should state the lack of definitive evidence.
+
+            2.  Comprehensive Reasoning: Elaborate on the `verdict_reasoning` by incorporating relevant insights from linguistic analysis (sentiment, sensationalism, bias) and the `claims_verified_details` from the Claim Verification Specialist. If its output lists `claims_not_verified`, state that those extracted claims were not independently verified.
+
+            3.  Compile Supporting Citations: Consolidate ALL unique URLs from 'supporting_urls_for_input_verification' (from Content Analysis) and 'all_verification_sources_consulted' (from Claim Verification). Present them clearly, with their titles where available. Remove duplicates.
+
+            4.  Count Sources: Calculate the total number of unique URLs (sources) compiled.
+
+            5.  Formulate Recommendation: Provide a clear, concise recommendation directly tied to the `final_verdict`.
+                * If "Fake": "AVOID SHARING THIS CONTENT. The original claim is false. The correct information is: [insert correct_information_if_debunked here]."
+                * If "Verified": "This information appears reliable and can be shared."
+                * If "Likely Verified": "This information appears largely reliable, but contains some sensationalism/bias. Share with mild caution."
+                * If "Uncertain": "Proceed with caution. The veracity of this information could not be definitively determined. Seek additional reputable sources."
+
+            Output a structured JSON object containing all these elements.
+            """
+
+FINAL_VERDICT_EXPECTED_OUTPUT = """
+        A structured JSON object containing:
+        {
+          "final_verdict": "Verified" | "Likely Verified" | "Uncertain" | "Likely Fake" | "Fake",
+          "verdict_reasoning": "A concise explanation of why this verdict was reached, primarily focused on the original input headline's veracity. If 'Fake', it *must* state the input claim is false and provide the correct information.",
+          "supporting_citations": [
+            {"title": "Source Title 1", "url": "http://source1.com"},
+            {"title": "Source Title 2", "url": "http://source2.com"}
+          ],
+          "total_sources_checked": 15,
+          "recommendation": "A clear recommendation for the user (e.g., 'AVOID SHARING THIS CONTENT. The original claim is false. The correct information is: X.', 'This information appears reliable and can be shared.')"
+        }
+        """
+
 def extract_json_from_markdown(text: str):
 
     json_block_pattern = re.compile(r'```json\s*(.*?)\s*```', re.DOTALL)
@@ -26,27 +76,180 @@ def extract_json_from_markdown(text: str):
 
     return parsed_json
 
-def fact_check_crew(news_headline_or_topic):
+def parse_stage_output(text: str):
+
+    parsed_json = extract_json_from_markdown(text)
 
-    start_time = time.time() # Start timing the execution
+    if not parsed_json:
+        try:
+            # Agents sometimes answer with bare JSON instead of a ```json block
+            parsed_json = json.loads(text.strip())
+        except (json.JSONDecodeError, AttributeError):
+            parsed_json = {}
+
+    return parsed_json if isinstance(parsed_json, dict) else {}
+
+def dedupe_stage_urls(parsed_output: dict):
+    """Dedupe (by canonical URL) and strip tracking parameters from, in place, every URL list an upstream task can emit."""
+
+    for key in ("supporting_urls_for_input_verification", "all_verification_sources_consulted"):
+        if isinstance(parsed_output.get(key), list):
+            parsed_output[key] = [
+                {"title": citation["title"], "link": citation["url"]}
+                for citation in dedupe_citations(parsed_output[key])
+            ]
+
+    for claim in parsed_output.get("claims_verified_details") or []:
+        if isinstance(claim, dict) and isinstance(claim.get("supporting_urls"), list):
+            urls = [url for url in claim["supporting_urls"] if isinstance(url, str)]
+            claim["supporting_urls"] = [citation["url"] for citation in dedupe_citations(urls)]
+
+    return parsed_output
+
+def collect_stage_citations(parsed_output: dict):
+
+    citations = []
+    citations.extend(parsed_output.get("supporting_urls_for_input_verification") or [])
+    citations.extend(parsed_output.get("all_verification_sources_consulted") or [])
+    for claim in parsed_output.get("claims_verified_details") or []:
+        if isinstance(claim, dict):
+            citations.extend(claim.get("supporting_urls") or [])
+
+    return citations
+
+_TERM_PATTERN = re.compile(r"[a-z0-9]+")
+_STOP_TERMS = {
+    "the", "and", "for", "that", "this", "with", "from", "have", "has", "was", "were", "will", "are",
+    "its", "not", "but", "been", "into", "over", "after", "about", "than", "their", "they", "says", "said",
+}
+
+def _claim_terms(text: str):
+
+    return {term for term in _TERM_PATTERN.findall(str(text).lower()) if len(term) > 2 and term not in _STOP_TERMS}
+
+def reconcile_speculative_verification(content_analysis: dict, verification: dict):
+    """
+    Keep, in place, only the speculative verification results that match the claims
+    content analysis extracted: a verified claim is kept when it shares at least two
+    terms with them; a consulted source is dropped only if discarded claims were all
+    that cited it. If no claim matches, everything is kept rather than leaving the
+    verdict without evidence. Extracted claims no kept result covers are listed under
+    `claims_not_verified` for the final verdict. Returns what was discarded and uncovered.
+    """
+
+    keyword_terms = {str(keyword): _claim_terms(keyword) for keyword in content_analysis.get("inferred_core_claims_keywords") or []}
+    reference_terms = set().union(*keyword_terms.values())
+
+    claims = [claim for claim in verification.get("claims_verified_details") or [] if isinstance(claim, dict)]
+    kept_claims = []
+    for claim in claims:
+        terms = _claim_terms(claim.get("claim_text", ""))
+        if terms and len(terms & reference_terms) >= min(2, len(terms)):
+            kept_claims.append(claim)
+
+    # Speculation verified the headline, which may not cover every claim extracted from it
+    kept_terms = [_claim_terms(claim.get("claim_text", "")) for claim in kept_claims]
+    uncovered = [
+        keyword for keyword, terms in keyword_terms.items()
+        if terms and not any(len(terms & claim_terms) >= min(2, len(terms)) for claim_terms in kept_terms)
+    ]
+    if uncovered:
+        verification["claims_not_verified"] = uncovered
+
+    if not kept_claims:
+        return {"discarded_claims": 0, "discarded_sources": 0, "uncovered_claims": uncovered}
+
+    # Sources are only dropped when nothing but discarded claims relied on them
+    kept_urls = {canonicalize_url(url) for claim in kept_claims for url in claim.get("supporting_urls") or []}
+    kept_urls |= {
+        canonicalize_url(citation.get("link", ""))
+        for citation in content_analysis.get("supporting_urls_for_input_verification") or [] if isinstance(citation, dict)
+    }
+    discarded_urls = {
+        canonicalize_url(url) for claim in claims if claim not in kept_claims for url in claim.get("supporting_urls") or []
+    } - kept_urls
+    sources = verification.get("all_verification_sources_consulted") or []
+    kept_sources = [
+        source for source in sources
+        if not (isinstance(source, dict) and canonicalize_url(source.get("link", "")) in discarded_urls)
+    ]
+
+    verification["claims_verified_details"] = kept_claims
+    verification["all_verification_sources_consulted"] = kept_sources
+    return {
+        "discarded_claims": len(claims) - len(kept_claims),
+        "discarded_sources": len(sources) - len(kept_sources),
+        "uncovered_claims": uncovered,
+    }
+
+def finalize_report(final_report: dict, stage_citations: list):
+
+    # Citations and source counts are computed deterministically, not trusted from the LLM
+    if final_report:
+        final_report["supporting_citations"] = dedupe_citations(
+            (final_report.get("supporting_citations") or []) + stage_citations
+        )
+        final_report["total_sources_checked"] = len(final_report["supporting_citations"])
+
+    return final_report
+
+def build_llm():
 
     llm_api_key = os.getenv('GEMINI_API_KEY') # SET your Desired LLM API Key in .env file as <PROVIDER_API_KEY> (e.g., GEMINI_API_KEY, OPENAI_API_KEY, etc.)
 
     if not llm_api_key:
         raise ValueError("LLM_API_KEY environment variable is not set in the .env file. Please set it to your desired LLM API key.")
-    
-    # Defining Tools
-    # =============================================================================
 
-    # Tool 1 - Configuring Gemini 2.0 Flash LLM
-    llm = LLM(
+    return LLM(
         model="gemini/gemini-2.0-flash", # call model by provider/model_name
         temperature=0.8, # 0.8 is default
         api_key=llm_api_key, # Set your LLM API Key here
     )
 
-    # Tool 2 - Serper API for Web Search
-    search_tool = SerperDevTool(n_results=3) # Increased results for better analysis
+def build_final_verdict_synthesizer(llm):
+
+    final_verdict_synthesizer = Agent(
+        role = "Final Verdict Synthesizer",
+        goal = "To consolidate all analytical insights, render a definitive verdict on the news item's authenticity, provide supporting citations, quantify sources checked, and offer a clear recommendation.",
+        backstory = '''
+        You are a seasoned expert in strategic communication and evidence synthesis, possessing years of experience in distilling complex analytical reports into clear, actionable intelligence. Your forte is integrating disparate data points from specialized analyses to construct a comprehensive, authoritative conclusion. You are adept at identifying the critical evidence needed to support a verdict, meticulously tracking sources, and crafting concise, practical recommendations for decision-makers. You excel at summarizing complex findings into an easily digestible format for end-users.''',
+        verbose = CREW_VERBOSE,
+        llm = llm
+    )
+
+    return final_verdict_synthesizer
+
+def run_fact_check(news_headline_or_topic, search_preset=DEFAULT_SEARCH_PRESET, speculative=SPECULATIVE_EXECUTION):
+    """
+    Run the fact-checking crew and return the full run record:
+    the parsed final report plus the raw output and timing of every stage.
+    `search_preset` is one of `search_tools.SEARCH_PRESETS` ("fast", "balanced", "thorough").
+    With `speculative`, claim verification works from the raw headline in parallel with
+    content analysis and is reconciled with the extracted claims once both finish.
+    """
+
+    started_at = time.time()
+    start_time = time.perf_counter() # Start timing the execution
+
+    trace = RunTrace(news_headline_or_topic)
+
+    # Defining Tools (a rate-limit timeout or bad configuration is a failed run too)
+    # =============================================================================
+
+    try:
+        # Every process on the box draws crew runs from one shared rate-limit budget
+        shared_cache.acquire("crew")
+
+        # Tool 1 - Configuring Gemini 2.0 Flash LLM
+        llm = build_llm()
+
+        # Tool 2 - Serper API for Web Search: starts shallow, widens only for inconclusive results.
+        # One tool per searching agent, each capped at its share of the run's search budget
+        analysis_search_tool = AdaptiveSerperDevTool(preset=search_preset, stage="content_analysis")
+        verification_search_tool = AdaptiveSerperDevTool(preset=search_preset, stage="claim_verification")
+    except Exception as e:
+        trace.finish(error=e)
+        raise
 
     # Defining Agents
     # =============================================================================
@@ -58,8 +261,8 @@ def fact_check_crew(news_headline_or_topic):
         You are an expert with over a decade of experience specializing in the subtle art of linguistic forensics, now highly adept at extracting meaningful signals from search engine snippets. Having processed trillions of words and observed how misinformation manifests online,
         your refined algorithms can infer characteristic patterns of sensationalism, emotional manipulation, or biased framing even when direct article text is inaccessible. You discern "red flags" by analyzing how a news piece is presented across various search results, identifying
         language, tone, and claim types that deviate from standard, objective reporting. Your expertise is in deriving powerful initial insights from limited textual exposure.''',
-        verbose = True,
-        tools=[search_tool],
+        verbose = CREW_VERBOSE,
+        tools=[analysis_search_tool],
         llm = llm
     )
 
@@ -70,19 +273,12 @@ def fact_check_crew(news_headline_or_topic):
         You are an expert with 8 years of focused experience in advanced information triage and dynamic information validation. Having historically refined your methods for identifying high-prevalence falsehoods, your current mandate is to leverage comprehensive search capabilities to rapidly confirm or
         refute specific assertions. You meticulously formulate queries to solicit direct factual answers, identify consensus among authoritative sources, or uncover explicit debunkings from the vast expanse of the internet. Your expertise lies in efficiently and accurately assessing the veracity of claims
         by consulting the most reliable external data available.''',
-        verbose = True,
-        tools=[search_tool],
+        verbose = CREW_VERBOSE,
+        tools=[verification_search_tool],
         llm = llm
     )
 
-    final_verdict_synthesizer = Agent(
-        role = "Final Verdict Synthesizer",
-        goal = "To consolidate all analytical insights, render a definitive verdict on the news item's authenticity, provide supporting citations, quantify sources checked, and offer a clear recommendation.",
-        backstory = '''
-        You are a seasoned expert in strategic communication and evidence synthesis, possessing years of experience in distilling complex analytical reports into clear, actionable intelligence. Your forte is integrating disparate data points from specialized analyses to construct a comprehensive, authoritative conclusion. You are adept at identifying the critical evidence needed to support a verdict, meticulously tracking sources, and crafting concise, practical recommendations for decision-makers. You excel at summarizing complex findings into an easily digestible format for end-users.''',
-        verbose = True,
-        llm = llm
-    )
+    final_verdict_synthesizer = build_final_verdict_synthesizer(llm)
 
 
     # Defining Tasks
@@ -119,14 +315,24 @@ def fact_check_crew(news_headline_or_topic):
             'inferred_core_claims_keywords': ['keyword1', 'keyword2', 'claim_summary_from_snippet']
         }
         ''',
-        agent=content_analysis_master
+        agent=content_analysis_master,
+        async_execution=speculative, # runs alongside claim verification; the final verdict waits for both
+        name="content_analysis"
     )
 
+    if speculative:
+        # The Content Analysis Master runs at the same time, so start from the headline itself
+        claims_source = '''identify the distinct factual claims in the news headline/topic "{news_headline_or_topic}"'''
+        claim_ingestion = '''Claim Ingestion: The Content Analysis Master is analyzing the same headline in parallel and its output is not available to you. Break "{news_headline_or_topic}" itself into its distinct factual claims, and start with direct searches such as "{news_headline_or_topic} fact check" and "{news_headline_or_topic} debunked".'''
+    else:
+        claims_source = "receive a precise list of inferred factual claims or key topics (from the Content Analysis Master's output)"
+        claim_ingestion = "Claim Ingestion: Accept the list of distinct factual claims or key topics directly provided by the Content Analysis Master."
+
     claim_verification_specialist_task = Task(
         description='''
-            As the Claim Verification Specialist, your primary task is to receive a precise list of inferred factual claims or key topics (from the Content Analysis Master's output) and perform a real-time, comprehensive verification using dynamic web searches using "Serper Tool". Leveraging your expertise in advanced information retrieval and evidence synthesis, this involves:
+            As the Claim Verification Specialist, your primary task is to ''' + claims_source + ''' and perform a real-time, comprehensive verification using dynamic web searches using "Serper Tool". Leveraging your expertise in advanced information retrieval and evidence synthesis, this involves:
 
-            1.  Claim Ingestion: Accept the list of distinct factual claims or key topics directly provided by the Content Analysis Master.
+            1.  ''' + claim_ingestion + '''
             2.  Strategic Web Search Execution: For each received claim/topic, utilize the SerperDev Tool to craft and execute highly specific Google search queries designed to ascertain its veracity. Queries will be formulated to directly target factual confirmation or refutation, e.g., "is [claim text] true," "[claim text] debunked," "[claim text] fact check," "[claim text] scientific consensus." Capture the URLs of the sources found for each claim.
             3.  Search Result Analysis and Evidence Synthesis: Systematically evaluate the top search results returned by the SerperDev Tool for each claim. This rigorous analysis includes:
                 * Identifying direct answers or strong consensus among highly authoritative and reputable sources (e.g., academic institutions, government bodies, established news organizations known for accuracy, scientific journals).
@@ -163,54 +369,65 @@ def fact_check_crew(news_headline_or_topic):
                 {'title': 'Source Title 2', 'link': 'http://debunking_site.org/claim2'}
             ]
             }''',
-        tools=[search_tool],
-        context=[content_analysis_master_task], # This provides the output of the content_analysis_master_task to this task
-        agent=claim_verification_specialist
+        tools=[verification_search_tool],
+        context=[] if speculative else [content_analysis_master_task], # This provides the output of the content_analysis_master_task to this task
+        agent=claim_verification_specialist,
+        async_execution=speculative,
+        name="claim_verification"
     )
 
     final_verdict_task = Task(
-        description="""
-            Your final task is to synthesize all analytical insights to provide a comprehensive, actionable verdict on the news item, **explicitly and primarily addressing the veracity of the user's original input headline: "{news_headline_or_topic}"**.
-
-            Instructions:
-            1.  Core Verdict Determination (Highest Priority):
-                * If 'input_headline_direct_verification_status' is 'debunked'**: The `final_verdict` **MUST be "Fake"**. The `verdict_reasoning` must clearly state that the input claim is false and provide the 'correct_information_if_debunked' from the Content Analysis Master.
-                * If 'input_headline_direct_verification_status' is 'verified'**:
-                    * If 'inferred_sensationalism_level' is 'high' OR 'overall_inferred_strong_bias' is true: "Likely Verified" (suggesting caution despite factual accuracy).
-                    * Otherwise: "Verified".
-                * If 'input_headline_direct_verification_status' is 'unverifiable'**: "Uncertain". The reasoning should state the lack of definitive evidence.
-
-            2.  Comprehensive Reasoning: Elaborate on the `verdict_reasoning` by incorporating relevant insights from linguistic analysis (sentiment, sensationalism, bias) and the `claims_verified_details` from the Claim Verification Specialist.
-
-            3.  Compile Supporting Citations: Consolidate ALL unique URLs from 'supporting_urls_for_input_verification' (from Content Analysis) and 'all_verification_sources_consulted' (from Claim Verification). Present them clearly, with their titles where available. Remove duplicates.
-
-            4.  Count Sources: Calculate the total number of unique URLs (sources) compiled.
-
-            5.  Formulate Recommendation: Provide a clear, concise recommendation directly tied to the `final_verdict`.
-                * If "Fake": "AVOID SHARING THIS CONTENT. The original claim is false. The correct information is: [insert correct_information_if_debunked here]."
-                * If "Verified": "This information appears reliable and can be shared."
-                * If "Likely Verified": "This information appears largely reliable, but contains some sensationalism/bias. Share with mild caution."
-                * If "Uncertain": "Proceed with caution. The veracity of this information could not be definitively determined. Seek additional reputable sources."
-
-            Output a structured JSON object containing all these elements.
-            """,
-        expected_output="""
-        A structured JSON object containing:
-        {
-          "final_verdict": "Verified" | "Likely Verified" | "Uncertain" | "Likely Fake" | "Fake",
-          "verdict_reasoning": "A concise explanation of why this verdict was reached, primarily focused on the original input headline's veracity. If 'Fake', it *must* state the input claim is false and provide the correct information.",
-          "supporting_citations": [
-            {"title": "Source Title 1", "url": "http://source1.com"},
-            {"title": "Source Title 2", "url": "http://source2.com"}
-          ],
-          "total_sources_checked": 15,
-          "recommendation": "A clear recommendation for the user (e.g., 'AVOID SHARING THIS CONTENT. The original claim is false. The correct information is: X.', 'This information appears reliable and can be shared.')"
-        }
-        """,
+        description=FINAL_VERDICT_DESCRIPTION,
+        expected_output=FINAL_VERDICT_EXPECTED_OUTPUT,
         agent=final_verdict_synthesizer,
-        context=[content_analysis_master_task, claim_verification_specialist_task]
+        context=[content_analysis_master_task, claim_verification_specialist_task],
+        name="final_verdict"
     )
 
+    # Recording per-stage outputs and timings
+    # =============================================================================
+
+    stage_outputs = {}
+    parsed_stages = {}
+    stage_timings = {}
+    speculation = {}
+    last_stage_end = [start_time]
+    # Speculative stages finish on their own threads
+    stage_lock = threading.Lock()
+
+    def record_stage(task_output):
+        now = time.perf_counter()
+
+        with stage_lock:
+            if task_output.name != "final_verdict":
+                # Deduplicated URLs are written back so downstream prompts never see the same source twice
+                parsed_output = parse_stage_output(task_output.raw)
+                if parsed_output:
+                    dedupe_stage_urls(parsed_output)
+                    task_output.raw = f"```json\n{json.dumps(parsed_output, indent=2)}\n```"
+                parsed_stages[task_output.name] = (task_output, parsed_output)
+
+            stage_outputs[task_output.name] = task_output.raw
+
+            # The second speculative stage to finish reconciles verification with the extracted
+            # claims; the final verdict task reads the rewritten output as its context
+            if speculative and not speculation and {"content_analysis", "claim_verification"} <= parsed_stages.keys():
+                verification_output, verification = parsed_stages["claim_verification"]
+                content_analysis = parsed_stages["content_analysis"][1]
+                if verification and content_analysis:
+                    speculation.update(reconcile_speculative_verification(content_analysis, verification))
+                    verification_output.raw = f"```json\n{json.dumps(verification, indent=2)}\n```"
+                else:
+                    # An unparseable stage leaves nothing to reconcile; verification is used as it is
+                    speculation.update(discarded_claims=0, discarded_sources=0, uncovered_claims=[])
+                stage_outputs["claim_verification"] = verification_output.raw
+
+            # Parallel stages both started with the crew, so each is timed from the start
+            stage_start = start_time if speculative and task_output.name != "final_verdict" else last_stage_end[0]
+            stage_timings[task_output.name] = round(now - stage_start, 3)
+            last_stage_end[0] = max(last_stage_end[0], now)
+        trace.record_task(task_output.name, task_output.raw)
+
     # Creating Crew
     # =============================================================================
 
@@ -218,20 +435,130 @@ def fact_check_crew(news_headline_or_topic):
         agents=[content_analysis_master, claim_verification_specialist, final_verdict_synthesizer], # Add the new agent
         tasks=[content_analysis_master_task, claim_verification_specialist_task, final_verdict_task], # Add the new task
         llm=llm,
-        verbose=True
+        verbose=CREW_VERBOSE,
+        task_callback=record_stage,
+        step_callback=trace.record_step
     )
 
     inputs = {
         "news_headline_or_topic" : news_headline_or_topic,
     }
 
-    # Running the Crew
-    result = crew.kickoff(inputs=inputs)
+    # Running the Crew (failed runs always keep their trace)
+    try:
+        result = crew.kickoff(inputs=inputs)
+    except Exception as e:
+        trace.finish(timings=stage_timings, error=e)
+        raise
 
     # Extracting the final report from the result
     final_report = extract_json_from_markdown(result.raw)
 
-    end_time = time.time() # End timing the execution
+    stage_citations = []
+    for name in ("content_analysis", "claim_verification"):
+        if name in parsed_stages:
+            stage_citations.extend(collect_stage_citations(parsed_stages[name][1]))
+    finalize_report(final_report, stage_citations)
+
+    end_time = time.perf_counter() # End timing the execution
     execution_time = end_time - start_time
 
-    return final_report
\ No newline at end of file
+    timings = {**stage_timings, "total": round(execution_time, 3)}
+    trace.finish(report=final_report, timings=timings)
+
+    return {
+        "claim": news_headline_or_topic,
+        "started_at": started_at,
+        "final_report": final_report,
+        "stage_outputs": stage_outputs,
+        "timings": timings,
+        "searches": analysis_search_tool.searches + verification_search_tool.searches,
+        "search_preset": search_preset,
+        "speculative": speculative,
+        **({"speculation": speculation} if speculative else {}),
+    }
+
+def resynthesize_verdict(news_headline_or_topic, stage_outputs, evidence_changes, searches):
+    """
+    Re-run only the Final Verdict Synthesizer on stored stage outputs plus the
+    search evidence that changed since they were produced. Returns a run record
+    shaped like `run_fact_check`'s, with the upstream stage outputs carried over.
+    """
+
+    started_at = time.time()
+    start_time = time.perf_counter()
+
+    stage_outputs = {name: raw for name, raw in stage_outputs.items() if name != "final_verdict"}
+
+    trace = RunTrace(news_headline_or_topic, kind="refresh")
+
+    try:
+        shared_cache.acquire("crew")
+        final_verdict_synthesizer = build_final_verdict_synthesizer(build_llm())
+    except Exception as e:
+        trace.finish(error=e)
+        raise
+
+    refresh_task = Task(
+        description='''
+            You are re-checking a claim that was analyzed before. The previous outputs of the Content Analysis Master and Claim Verification Specialist were:
+
+            {previous_stage_outputs}
+
+            Re-running their web searches has surfaced the following new or changed sources since then. Each has its title, URL, whether the source is "new" or its search snippet "changed", the current snippet and, for changed sources where it is known, the previous snippet:
+
+            {evidence_changes}
+
+            Treat these snippets as the most recent evidence: where they confirm or refute the claim more decisively than the previous outputs, they take precedence.
+            ''' + FINAL_VERDICT_DESCRIPTION,
+        expected_output=FINAL_VERDICT_EXPECTED_OUTPUT,
+        agent=final_verdict_synthesizer,
+        name="final_verdict"
+    )
+
+    crew = Crew(
+        agents=[final_verdict_synthesizer],
+        tasks=[refresh_task],
+        verbose=CREW_VERBOSE,
+        step_callback=trace.record_step
+    )
+
+    inputs = {
+        "news_headline_or_topic" : news_headline_or_topic,
+        "previous_stage_outputs" : "\n\n".join(stage_outputs.values()),
+        "evidence_changes" : json.dumps(evidence_changes, indent=2),
+    }
+
+    try:
+        result = crew.kickoff(inputs=inputs)
+    except Exception as e:
+        trace.finish(error=e)
+        raise
+
+    trace.record_task("final_verdict", result.raw)
+
+    final_report = extract_json_from_markdown(result.raw)
+
+    stage_citations = []
+    for raw in stage_outputs.values():
+        stage_citations.extend(collect_stage_citations(parse_stage_output(raw)))
+    stage_citations.extend(evidence_changes)
+    finalize_report(final_report, stage_citations)
+
+    execution_time = time.perf_counter() - start_time
+
+    timings = {"final_verdict": round(execution_time, 3), "total": round(execution_time, 3)}
+    trace.finish(report=final_report, timings=timings)
+
+    return {
+        "claim": news_headline_or_topic,
+        "started_at": started_at,
+        "final_report": final_report,
+        "stage_outputs": {**stage_outputs, "final_verdict": result.raw},
+        "timings": timings,
+        "searches": searches,
+    }
+
+def fact_check_crew(news_headline_or_topic, search_preset=DEFAULT_SEARCH_PRESET, speculative=SPECULATIVE_EXECUTION):
+
+    return run_fact_check(news_headline_or_topic, search_preset=search_preset, speculative=speculative)["final_report"]
\ No newline at end of file
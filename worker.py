@@ -0,0 +1,361 @@
+import argparse
+import importlib
+import json
+import ipaddress
+import multiprocessing
+import os
+import secrets
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.connection import Client, Listener
+from typing import Any, Dict, Optional
+
+import result_store
+import shared_cache
+
+# Multi-process crew execution.
+# =============================================================================
+#
+# `python worker.py serve --workers 4` starts a pool of worker processes that
+# run `fact_check_crew` outside the Streamlit process (and outside its GIL).
+# UI processes send requests over a local socket (FACTBOT_WORKER_ADDRESS) with
+# `WorkerClient`.
+#
+# Requests are pickled, so whoever can connect with the auth key can run code in
+# the workers. By default the server listens on a Unix socket inside a private
+# (0700) directory, and the key is a random one generated into a 0600 file there
+# that clients read. TCP is only used when a host:port address is given, and a
+# non-loopback host also requires an explicit FACTBOT_WORKER_AUTHKEY.
+#
+# All workers share:
+#   * the result store, used as the verdict cache (FACTBOT_VERDICT_CACHE_TTL)
+#   * the on-disk search cache and rate-limit budgets in `shared_cache`
+# both SQLite/WAL files that are safe for concurrent access.
+#
+# `python worker.py bench` measures how throughput scales with worker count,
+# using a stubbed crew (fixed I/O wait plus CPU work), see the README.
+
+WORKER_ADDRESS = os.getenv("FACTBOT_WORKER_ADDRESS", "")
+WORKER_DIR = os.getenv("FACTBOT_WORKER_DIR", os.path.join(os.path.expanduser("~"), ".factbot"))
+WORKER_AUTHKEY_FILE = os.path.join(WORKER_DIR, "worker.key")
+# Windows has no Unix sockets in multiprocessing.connection
+DEFAULT_WORKER_ADDRESS = "127.0.0.1:8765" if sys.platform == "win32" else os.path.join(WORKER_DIR, "worker.sock")
+VERDICT_CACHE_TTL = float(os.getenv("FACTBOT_VERDICT_CACHE_TTL", "900"))  # seconds, 0 = off
+
+# Set in each worker process by `_init_worker`; a dict only when benchmarking with a stub crew
+_stub_crew: Optional[Dict[str, float]] = None
+
+
+def parse_address(address: str):
+    """'host:port' -> TCP address, anything else -> Unix socket path."""
+    host, _, port = address.rpartition(":")
+    if host and port.isdigit():
+        return (host, int(port))
+    return os.path.expanduser(address)
+
+
+def is_loopback(address) -> bool:
+    """True for Unix socket paths and TCP addresses on a loopback host."""
+    if isinstance(address, str):
+        return True
+    host = address[0]
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def load_authkey(create: bool = False) -> bytes:
+    """
+    FACTBOT_WORKER_AUTHKEY if set, otherwise the key in WORKER_AUTHKEY_FILE. With
+    `create` (the server), a missing key file is generated with 0600 permissions.
+    """
+    env_key = os.getenv("FACTBOT_WORKER_AUTHKEY")
+    if env_key:
+        return env_key.encode("utf-8")
+    if create and not os.path.exists(WORKER_AUTHKEY_FILE):
+        os.makedirs(WORKER_DIR, mode=0o700, exist_ok=True)
+        try:
+            fd = os.open(WORKER_AUTHKEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            pass  # another server created it first
+        else:
+            with os.fdopen(fd, "w") as f:
+                f.write(secrets.token_hex(32))
+    try:
+        with open(WORKER_AUTHKEY_FILE) as f:
+            return f.read().strip().encode("utf-8")
+    except FileNotFoundError:
+        raise RuntimeError(
+            f"No worker auth key: start `python worker.py serve` first (it creates {WORKER_AUTHKEY_FILE}) "
+            "or set FACTBOT_WORKER_AUTHKEY to the server's key"
+        ) from None
+
+
+def _remove_stale_socket(path: str):
+    """Delete a socket file left behind by a server that is no longer running."""
+    if not os.path.exists(path):
+        return
+    with socket.socket(socket.AF_UNIX) as probe:
+        try:
+            probe.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(path)
+        else:
+            raise RuntimeError(f"A worker server is already listening on {path}")
+
+
+def _init_worker(stub_crew: Optional[Dict[str, float]]):
+    global _stub_crew
+    _stub_crew = stub_crew
+    if stub_crew is None:
+        # Pay the crewai import once per worker instead of on the first request
+        importlib.import_module("trigger_crew")
+
+
+def _run_stub_crew(claim: str, search_preset: str, speculative: bool) -> Dict[str, Any]:
+    """Stand-in for `run_fact_check`: waits like the APIs would and burns CPU like parsing would."""
+    time.sleep(_stub_crew["latency"])
+    deadline = time.process_time() + _stub_crew["cpu_ms"] / 1000
+    payload = {"claims": [{"claim_text": claim, "supporting_urls": [f"https://example.com/{i}" for i in range(20)]}] * 20}
+    while time.process_time() < deadline:
+        json.loads(json.dumps(payload))
+    return {
+        "claim": claim,
+        "started_at": time.time(),
+        "final_report": {"final_verdict": "Uncertain", "supporting_citations": [], "total_sources_checked": 0},
+        "stage_outputs": {},
+        "timings": {"total": _stub_crew["latency"]},
+        "searches": [],
+        "search_preset": search_preset,
+        "speculative": speculative,
+    }
+
+
+def cached_run(claim: str, search_preset: str, speculative: bool) -> Optional[Dict[str, Any]]:
+    """
+    Latest stored run for `claim` with a verdict if it was produced or re-checked within
+    VERDICT_CACHE_TTL with at least the requested search depth. Speculative runs only
+    answer speculative requests.
+    """
+    if VERDICT_CACHE_TTL <= 0:
+        return None
+    from search_tools import SEARCH_PRESETS
+
+    presets = list(SEARCH_PRESETS)
+    deep_enough = presets[presets.index(search_preset):] if search_preset in presets else [search_preset]
+    run = result_store.latest_run_for_claim(
+        claim, search_presets=deep_enough, include_speculative=speculative, require_verdict=True
+    )
+    if run and (run.get("checked_at") or run["created_at"]) >= time.time() - VERDICT_CACHE_TTL:
+        return run
+    return None
+
+
+def execute_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Runs in a worker process. Never raises: errors are returned to the client."""
+    try:
+        claim = request["claim"]
+        search_preset = request.get("search_preset", "balanced")
+        speculative = request.get("speculative", False)
+
+        if _stub_crew is not None:
+            run = _run_stub_crew(claim, search_preset, speculative)
+        else:
+            cached = cached_run(claim, search_preset, speculative)
+            if cached:
+                # Served checks still count towards the claim's hotness (see refresh.py)
+                result_store.record_check(claim, cached["id"])
+                return {"ok": True, "run": cached, "run_id": cached["id"], "cached": True}
+
+            from trigger_crew import run_fact_check
+            run = run_fact_check(claim, search_preset=search_preset, speculative=speculative)
+
+        return {"ok": True, "run": run, "run_id": result_store.save_run(run), "cached": False}
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+
+class WorkerServer:
+    """Accepts client connections on `address` and fans requests out to a process pool."""
+
+    def __init__(
+        self, address: str, workers: int, stub_crew: Optional[Dict[str, float]] = None, authkey: Optional[bytes] = None
+    ):
+        self.address = parse_address(address)
+        if not is_loopback(self.address) and not os.getenv("FACTBOT_WORKER_AUTHKEY"):
+            raise RuntimeError(
+                f"Refusing to listen on {address} without FACTBOT_WORKER_AUTHKEY: set a secret key shared with the clients"
+            )
+        authkey = authkey or load_authkey(create=True)
+        if isinstance(self.address, str):
+            os.makedirs(os.path.dirname(os.path.abspath(self.address)), mode=0o700, exist_ok=True)
+            _remove_stale_socket(self.address)
+
+        self.workers = workers
+        self.stub_crew = stub_crew
+        self.pool = self._new_pool()
+        self._pool_lock = threading.Lock()
+        self.listener = Listener(self.address, authkey=authkey)
+        if isinstance(self.address, str):
+            os.chmod(self.address, 0o600)
+        self._closed = threading.Event()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.stub_crew,),
+        )
+
+    def submit(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one request on the pool and return its response."""
+        pool = self.pool
+        try:
+            return pool.submit(execute_request, request).result()
+        except BrokenProcessPool as e:
+            # A worker died (OOM kill, crash): fail this request and replace the pool once
+            with self._pool_lock:
+                if self.pool is pool and not self._closed.is_set():
+                    self.pool = self._new_pool()
+                    pool.shutdown(wait=False, cancel_futures=True)
+            return {"ok": False, "error": f"BrokenProcessPool: {e}"}
+
+    def serve_forever(self):
+        while not self._closed.is_set():
+            try:
+                conn = self.listener.accept()
+            except (OSError, EOFError):
+                if self._closed.is_set():
+                    break
+                continue
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        with conn:
+            try:
+                request = conn.recv()
+                if request.get("op") == "ping":
+                    conn.send({"ok": True})
+                else:
+                    conn.send(self.submit(request))
+            except (EOFError, OSError):
+                pass  # client went away
+
+    def close(self):
+        self._closed.set()
+        self.listener.close()
+        with self._pool_lock:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+class WorkerClient:
+    """Used by UI processes: one connection per request, so it is safe across Streamlit threads."""
+
+    def __init__(self, address: str = WORKER_ADDRESS or DEFAULT_WORKER_ADDRESS, authkey: Optional[bytes] = None):
+        self.address = parse_address(address)
+        self.authkey = authkey or load_authkey()
+
+    def _request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        with Client(self.address, authkey=self.authkey) as conn:
+            conn.send(request)
+            return conn.recv()
+
+    def ping(self) -> bool:
+        try:
+            return self._request({"op": "ping"}).get("ok", False)
+        except OSError:
+            return False
+
+    def fact_check(self, claim: str, search_preset: str = "balanced", speculative: bool = False) -> Dict[str, Any]:
+        """Same record as `trigger_crew.run_fact_check`; the worker has already saved it to the store."""
+        response = self._request(
+            {"op": "fact_check", "claim": claim, "search_preset": search_preset, "speculative": speculative}
+        )
+        if not response["ok"]:
+            raise RuntimeError(f"Worker failed: {response['error']}")
+        return response["run"]
+
+
+def benchmark(worker_counts, requests: int, concurrency: int, latency: float, cpu_ms: float):
+    """Throughput of the worker pool (requests/sec) for each worker count, with a stubbed crew."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Benchmarks must not touch the real history or cache
+    bench_dir = tempfile.mkdtemp(prefix="factbot-bench-")
+    os.environ["FACTBOT_DB_PATH"] = result_store.DB_PATH = os.path.join(bench_dir, "history.db")
+    os.environ["FACTBOT_CACHE_PATH"] = shared_cache.CACHE_PATH = os.path.join(bench_dir, "cache.db")
+
+    authkey = secrets.token_bytes(32)
+    results = []
+    for workers in worker_counts:
+        address = os.path.join(bench_dir, f"bench-{workers}.sock") if sys.platform != "win32" else DEFAULT_WORKER_ADDRESS
+        server = WorkerServer(address, workers, stub_crew={"latency": latency, "cpu_ms": cpu_ms}, authkey=authkey)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        client = WorkerClient(address, authkey=authkey)
+
+        # Warm every worker process up before timing
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda i: client.fact_check(f"warm-up {workers}-{i}"), range(workers)))
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(lambda i: client.fact_check(f"bench claim {workers}-{i}"), range(requests)))
+        elapsed = time.perf_counter() - start
+        server.close()
+
+        results.append({"workers": workers, "requests_per_sec": round(requests / elapsed, 2), "seconds": round(elapsed, 2)})
+        print(f"{workers:>3} workers: {requests / elapsed:7.2f} req/s ({elapsed:.2f}s for {requests} requests)")
+
+    baseline = results[0]["requests_per_sec"]
+    for result in results:
+        result["speedup"] = round(result["requests_per_sec"] / baseline, 2)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FactBot crew worker pool.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="run the worker pool")
+    serve.add_argument(
+        "--address",
+        default=WORKER_ADDRESS or DEFAULT_WORKER_ADDRESS,
+        help=f"Unix socket path (default {DEFAULT_WORKER_ADDRESS}) or host:port for TCP",
+    )
+    serve.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+
+    bench = commands.add_parser("bench", help="measure throughput scaling with a stubbed crew")
+    bench.add_argument("--workers", default="1,2,4,8", help="comma-separated worker counts")
+    bench.add_argument("--requests", type=int, default=64)
+    bench.add_argument("--concurrency", type=int, default=32, help="simultaneous client requests")
+    bench.add_argument("--latency", type=float, default=0.2, help="stubbed API wait per request (s)")
+    bench.add_argument("--cpu-ms", type=float, default=200, help="stubbed CPU work per request (ms)")
+    bench.add_argument("--json", dest="json_path", help="also write the results to this JSON file")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        shared_cache.purge_search_cache()
+        server = WorkerServer(args.address, args.workers)
+        print(f"FactBot workers: {args.workers} processes listening on {args.address}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.close()
+    else:
+        bench_results = benchmark(
+            [int(count) for count in args.workers.split(",")], args.requests, args.concurrency, args.latency, args.cpu_ms
+        )
+        print(json.dumps(bench_results, indent=2))
+        if args.json_path:
+            with open(args.json_path, "w") as f:
+                json.dump(bench_results, f, indent=2)